@@ -26,6 +26,11 @@ class BaseBackend(ABC):
     implementations (Vosk, Whisper, etc.).
     """
 
+    # Slots keep attribute access on the per-chunk hot path at the
+    # C descriptor level instead of a __dict__ lookup; subclasses that
+    # do not declare __slots__ themselves still get a __dict__
+    __slots__ = ('name', '_status', '_error_message', '_current_session')
+
     def __init__(self, name: str):
         """
         Initialize the backend.
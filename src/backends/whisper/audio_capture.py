@@ -5,6 +5,7 @@ This module provides continuous microphone audio capture with intelligent
 voice activity detection to determine when to send audio for transcription.
 """
 
+import math
 import pyaudio
 import numpy as np
 import threading
@@ -162,8 +163,10 @@ class MicrophoneStream:
             data = self.audio_queue.get_nowait()
             # Convert bytes to numpy array of int16 samples
             audio_array = np.frombuffer(data, dtype=np.int16)
-            # Convert to float32 and normalize to [-1, 1]
-            audio_array = audio_array.astype(np.float32) / 32768.0
+            # Convert to float32 and normalize to [-1, 1] in place
+            # (astype owns the buffer, so the divide needs no extra copy)
+            audio_array = audio_array.astype(np.float32)
+            audio_array /= 32768.0
 
             # Resample if necessary
             if self.actual_sample_rate != self.target_sample_rate:
@@ -210,12 +213,21 @@ class VoiceActivityDetector:
         self.sample_rate = sample_rate
         self.frame_size = int(sample_rate * frame_duration_ms / 1000)
         self.energy_threshold = energy_threshold
+        # Squared threshold: the per-frame check compares mean-square
+        # energy directly, skipping the sqrt
+        self._energy_threshold_sq = energy_threshold ** 2
         self.silence_frames = int(silence_duration * 1000 / frame_duration_ms)
         self.vad_aggressiveness = vad_aggressiveness
 
         self.is_speaking = False
         self.silence_counter = 0
-        self.audio_buffer = []
+
+        # Preallocated segment buffer: frames are written in place via
+        # slice assignment, so emitting a segment is one copy instead of
+        # a concatenate over a growing list. 60s covers any realistic
+        # dictation segment; the buffer doubles in the rare overflow.
+        self._seg_buf = np.empty(sample_rate * 60, dtype=np.float32)
+        self._seg_len = 0
 
         # Try to import webrtcvad, fallback to energy-based detection
         try:
@@ -254,7 +266,7 @@ class VoiceActivityDetector:
         # Check if this frame contains speech
         is_speech = self.vad.is_speech(frame_bytes, self.sample_rate)
 
-        self.audio_buffer.extend(audio_frame)
+        self._append_frame(audio_frame)
 
         if is_speech:
             if not self.is_speaking:
@@ -264,56 +276,77 @@ class VoiceActivityDetector:
         else:
             if self.is_speaking:
                 self.silence_counter += 1
-                debug(f"Silence detected: {self.silence_counter}/{self.silence_frames} frames")
+                # %-style args: this runs per frame, so defer formatting
+                # until the debug gate passes
+                debug("Silence detected: %d/%d frames", self.silence_counter, self.silence_frames)
                 if self.silence_counter >= self.silence_frames:
-                    # Speech ended, return buffered audio
                     self.is_speaking = False
-                    audio_chunk = np.array(self.audio_buffer)
+                    audio_chunk = self._emit_segment()
                     duration = len(audio_chunk) / self.sample_rate
-                    self.audio_buffer = []
                     self.silence_counter = 0
                     info(f"Speech ended (WebRTC VAD): {len(audio_chunk)} samples ({duration:.2f}s)")
                     return (False, audio_chunk)
 
         return (is_speech, None)
 
+    def _append_frame(self, audio_frame: np.ndarray):
+        """Write a frame into the preallocated segment buffer."""
+        n = len(audio_frame)
+        if self._seg_len + n > len(self._seg_buf):
+            # Rare: segment outgrew the buffer, double it
+            grown = np.empty(max(len(self._seg_buf) * 2, self._seg_len + n),
+                             dtype=np.float32)
+            grown[:self._seg_len] = self._seg_buf[:self._seg_len]
+            self._seg_buf = grown
+        self._seg_buf[self._seg_len:self._seg_len + n] = audio_frame
+        self._seg_len += n
+
+    def _emit_segment(self) -> np.ndarray:
+        """Copy out the accumulated segment and reset the buffer."""
+        segment = self._seg_buf[:self._seg_len].copy()
+        self._seg_len = 0
+        return segment
+
     def _process_energy_frame(self, audio_frame: np.ndarray) -> tuple[bool, Optional[np.ndarray]]:
         """Process frame using energy-based detection."""
-        # Calculate RMS energy
-        energy = np.sqrt(np.mean(audio_frame ** 2))
+        # Mean-square energy via a single BLAS dot product: no squared
+        # temporary array and no sqrt - the comparison uses the squared
+        # threshold instead. Scalar sqrt below is only for log output.
+        energy_sq = float(np.dot(audio_frame, audio_frame)) / len(audio_frame)
+        is_speech = energy_sq > self._energy_threshold_sq
 
-        self.audio_buffer.extend(audio_frame)
+        self._append_frame(audio_frame)
 
-        if energy > self.energy_threshold:
+        if is_speech:
             if not self.is_speaking:
                 self.is_speaking = True
-                info(f"Speech started (energy-based): energy={energy:.4f} > threshold={self.energy_threshold:.4f}")
+                info(f"Speech started (energy-based): energy={math.sqrt(energy_sq):.4f} > threshold={self.energy_threshold:.4f}")
             self.silence_counter = 0
-            debug(f"Speech active: energy={energy:.4f}")
+            # %-style args defer the float formatting on this per-frame path
+            debug("Speech active: energy=%.4f", math.sqrt(energy_sq))
         else:
             if self.is_speaking:
                 self.silence_counter += 1
-                debug(f"Silence detected: {self.silence_counter}/{self.silence_frames} frames (energy={energy:.4f})")
+                debug("Silence detected: %d/%d frames (energy=%.4f)",
+                      self.silence_counter, self.silence_frames, math.sqrt(energy_sq))
                 if self.silence_counter >= self.silence_frames:
-                    # Speech ended, return buffered audio
                     self.is_speaking = False
-                    audio_chunk = np.array(self.audio_buffer)
+                    audio_chunk = self._emit_segment()
                     duration = len(audio_chunk) / self.sample_rate
-                    self.audio_buffer = []
                     self.silence_counter = 0
                     info(f"Speech ended (energy-based): {len(audio_chunk)} samples ({duration:.2f}s)")
                     return (False, audio_chunk)
             else:
                 # Not speaking and low energy - just noise
-                debug(f"Background noise: energy={energy:.4f}")
+                debug("Background noise: energy=%.4f", math.sqrt(energy_sq))
 
-        return (energy > self.energy_threshold, None)
+        return (is_speech, None)
 
     def reset(self):
         """Reset VAD state."""
         self.is_speaking = False
         self.silence_counter = 0
-        self.audio_buffer = []
+        self._seg_len = 0
 
 
 class AudioCapture:
@@ -349,6 +382,9 @@ class AudioCapture:
         self.on_audio_chunk = on_audio_chunk
         self.sample_rate = sample_rate
         self.min_audio_length = min_audio_length
+        # Derived once here so the capture loop compares plain ints
+        # instead of repeating the float multiply per emitted chunk
+        self._min_samples = int(min_audio_length * sample_rate)
 
         self.mic_stream = MicrophoneStream(
             sample_rate=sample_rate,
@@ -409,9 +445,12 @@ class AudioCapture:
             # If VAD detected speech end, send chunk for transcription
             if audio_chunk is not None and len(audio_chunk) > 0:
                 # Minimum chunk size to avoid processing very short audio
-                min_samples = int(self.min_audio_length * self.sample_rate)
+                min_samples = self._min_samples
                 if len(audio_chunk) >= min_samples:
-                    debug(f"Audio chunk ready: {len(audio_chunk)} samples ({len(audio_chunk)/self.sample_rate:.2f}s)")
+                    debug("Audio chunk ready: %d samples (%.2fs)",
+                          len(audio_chunk), len(audio_chunk) / self.sample_rate)
                     self.on_audio_chunk(audio_chunk)
                 else:
-                    debug(f"Audio chunk too short: {len(audio_chunk)} samples ({len(audio_chunk)/self.sample_rate:.2f}s) < {min_samples} samples ({self.min_audio_length}s)")
\ No newline at end of file
+                    debug("Audio chunk too short: %d samples (%.2fs) < %d samples (%ss)",
+                          len(audio_chunk), len(audio_chunk) / self.sample_rate,
+                          min_samples, self.min_audio_length)
\ No newline at end of file
@@ -31,7 +31,11 @@ class CommandRegistry:
         """
         self.database = database
         self.commands: Dict[str, CommandAction] = {}
+        # Prefix trie over command names for multi-word lookup; the empty
+        # string key marks a complete command at that node
+        self._trie: Dict = {}
         self._load_commands()
+        self._rebuild_trie()
 
     def _load_commands(self):
         """Load commands from database or default JSON file"""
@@ -80,8 +84,18 @@ class CommandRegistry:
                 custom=data.get('custom', False)
             )
             self.commands[name.lower()] = command
+        self._rebuild_trie()
         info(f"Loaded {len(self.commands)} commands")
 
+    def _rebuild_trie(self):
+        """Rebuild the word-prefix trie from the current command names"""
+        self._trie = {}
+        for name in self.commands:
+            node = self._trie
+            for word in name.split():
+                node = node.setdefault(word, {})
+            node[''] = name
+
     @staticmethod
     def get_default_commands_path() -> Path:
         """Get path to default commands JSON file"""
@@ -111,6 +125,7 @@ class CommandRegistry:
             custom=True
         )
         self.commands[name.lower()] = command
+        self._rebuild_trie()
         info(f"Registered custom command: '{name}' -> {keys}")
 
     def unregister_command(self, name: str):
@@ -118,6 +133,7 @@ class CommandRegistry:
         name_lower = name.lower()
         if name_lower in self.commands and self.commands[name_lower].custom:
             del self.commands[name_lower]
+            self._rebuild_trie()
             info(f"Unregistered custom command: '{name}'")
             return True
         return False
@@ -126,6 +142,31 @@ class CommandRegistry:
         """Get command by name"""
         return self.commands.get(name.lower())
 
+    def find_longest_command(self, words: List[str], max_words: int) -> Optional[tuple]:
+        """
+        Find the longest registered command that prefixes a word list.
+
+        Walks the command trie word by word (no prefix joins), remembering
+        the deepest complete command seen.
+
+        Args:
+            words: Lowercased words to match against
+            max_words: Maximum number of words to consume
+
+        Returns:
+            Tuple of (command_name, words_consumed), or None if no match
+        """
+        node = self._trie
+        best = None
+        for i, word in enumerate(words[:max_words]):
+            node = node.get(word)
+            if node is None:
+                break
+            name = node.get('')
+            if name is not None:
+                best = (name, i + 1)
+        return best
+
     def find_matching_command(self, spoken_command: str) -> Optional[CommandAction]:
         """Find command that best matches spoken input"""
         spoken_lower = spoken_command.lower().strip()
@@ -5,13 +5,38 @@ Uses xdotool to type text directly into any application,
 mimicking nerd-dictation's behavior.
 """
 
+import collections
+import functools
+import os
+import re
+import shlex
 import subprocess
 import threading
 from typing import Optional, Callable
-import queue
 
 from src.core.logging_controller import info, debug, warning, error, critical
 
+# Optional: python-libxdo bindings for in-process keyboard output.
+# Avoids subprocess overhead entirely by calling libxdo (the C library
+# xdotool wraps) directly. Falls back to the xdotool subprocess if missing.
+try:
+    from xdo import Xdo
+    XDO_AVAILABLE = True
+except ImportError:
+    Xdo = None
+    XDO_AVAILABLE = False
+
+
+@functools.lru_cache(maxsize=1)
+def _xdotool_available() -> bool:
+    """Probe for the xdotool binary once per process."""
+    try:
+        subprocess.run(['xdotool', '--version'],
+                       capture_output=True, check=True)
+        return True
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return False
+
 
 class KeyboardOutput:
     """
@@ -37,23 +62,41 @@ class KeyboardOutput:
         self.clear_modifiers = clear_modifiers
         self.on_error = on_error
 
-        # Check if xdotool is available
-        try:
-            subprocess.run(['xdotool', '--version'],
-                          capture_output=True, check=True)
-            self.xdotool_available = True
-            info("xdotool found and working")
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            self.xdotool_available = False
-            error_msg = "xdotool not found. Install with: sudo apt install xdotool"
-            error(error_msg)
-            if on_error:
-                on_error(error_msg)
+        # Prefer direct libxdo calls (no subprocess at all)
+        self.xdo = None
+        if XDO_AVAILABLE:
+            try:
+                self.xdo = Xdo()
+                info("Using libxdo for in-process keyboard output")
+            except Exception as e:
+                warning(f"libxdo initialization failed, falling back to xdotool: {e}")
 
-        self.output_queue = queue.Queue()
+        if self.xdo is not None:
+            self.xdotool_available = True
+        else:
+            # Check if the xdotool binary is available as fallback
+            # (probe result is cached for the process lifetime)
+            self.xdotool_available = _xdotool_available()
+            if self.xdotool_available:
+                info("xdotool found and working")
+            else:
+                error_msg = "xdotool not found. Install with: sudo apt install xdotool"
+                error(error_msg)
+                if on_error:
+                    on_error(error_msg)
+
+        # Single-producer/single-consumer queue: deque append/popleft are
+        # atomic under the GIL, so no per-message mutex is needed; the
+        # Event provides the blocking wakeup
+        self.output_queue = collections.deque()
+        self._wake = threading.Event()
         self.is_running = False
         self.output_thread: Optional[threading.Thread] = None
 
+        # Persistent xdotool process (script mode), started in start()
+        self.proc: Optional[subprocess.Popen] = None
+        self._proc_fd: Optional[int] = None
+
         # Track previous text for correction support (like nerd-dictation)
         self.previous_text = ""
 
@@ -67,6 +110,33 @@ class KeyboardOutput:
             warning("Keyboard output already running")
             return True
 
+        # Launch a single long-lived xdotool in script mode and stream
+        # key commands to its stdin, instead of one fork/exec per
+        # command. Script mode splits each line on whitespace without
+        # shell unquoting, so only commands whose arguments can never
+        # contain spaces (key/keyup names) go through it - text typing
+        # uses a one-shot argv invocation where the text is a single
+        # argument. Not needed when libxdo is driven in-process.
+        if self.xdo is None:
+            try:
+                # stderr goes to DEVNULL: an unread PIPE would fill up and
+                # block xdotool once it logged ~64KB of errors
+                self.proc = subprocess.Popen(
+                    ['xdotool', '-'],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    bufsize=0
+                )
+                # Raw pipe fd: os.write() skips the buffered file wrapper
+                # (lock + encode + flush) for a single syscall per command
+                self._proc_fd = self.proc.stdin.fileno()
+            except Exception as e:
+                error(f"Failed to start xdotool process: {e}")
+                if self.on_error:
+                    self.on_error(f"Failed to start xdotool process: {e}")
+                return False
+
         self.is_running = True
         self.output_thread = threading.Thread(target=self._output_loop)
         self.output_thread.daemon = True
@@ -83,17 +153,31 @@ class KeyboardOutput:
         self.is_running = False
 
         # Add sentinel value to wake up worker
-        self.output_queue.put(None)
+        self.output_queue.append(None)
+        self._wake.set()
 
         if self.output_thread:
             self.output_thread.join(timeout=1.0)
 
+        # Shut down the persistent xdotool process
+        if self.proc:
+            try:
+                if self.proc.stdin:
+                    self.proc.stdin.close()
+                self.proc.wait(timeout=1.0)
+            except Exception as e:
+                warning(f"xdotool process did not exit cleanly: {e}")
+                self.proc.kill()
+            self.proc = None
+            self._proc_fd = None
+
         # Reset previous text on stop
         self.previous_text = ""
 
         info("Stopped keyboard output worker")
 
-    def type_text(self, text: str, enable_correction: bool = True):
+    def type_text(self, text: str, enable_correction: bool = True,
+                  completion_event: Optional[threading.Event] = None):
         """
         Queue text to be typed with optional correction support.
 
@@ -103,42 +187,66 @@ class KeyboardOutput:
         Args:
             text: Text to type
             enable_correction: Enable correction by comparing with previous text
+            completion_event: Optional event set once the text has been
+                dispatched to the keyboard, so callers can wait for the
+                flush instead of sleeping a pessimistic upper bound
         """
         if not self.xdotool_available:
             error("Cannot type text: xdotool not available")
+            if completion_event:
+                completion_event.set()
+            return
+
+        # Filter blank hypotheses here rather than in the worker, so they
+        # never pay the queue traffic or wake the output thread
+        if not text or not text.strip():
+            if completion_event:
+                completion_event.set()
             return
 
         if self.is_running:
-            self.output_queue.put((text, enable_correction))
+            self.output_queue.append((text, enable_correction, completion_event))
+            self._wake.set()
         else:
             warning("Keyboard output not running, cannot type text")
+            if completion_event:
+                completion_event.set()
 
     def _output_loop(self):
         """Main output loop that runs in background thread."""
         while self.is_running:
-            try:
-                # Get text from queue with timeout
-                item = self.output_queue.get(timeout=0.1)
-
-                # Check for sentinel value
-                if item is None:
-                    break
-
-                # Handle both old format (string) and new format (tuple)
-                if isinstance(item, tuple):
-                    text, enable_correction = item
-                else:
-                    text, enable_correction = item, False
-
-                # Type the text with optional correction
-                self._type_text_with_correction(text, enable_correction)
-
-            except queue.Empty:
-                continue
-            except Exception as e:
-                error(f"Output loop error: {e}")
-                if self.on_error:
-                    self.on_error(f"Output error: {e}")
+            # Block until work arrives - no polling wakeups while idle.
+            # stop() pushes a None sentinel and sets the event.
+            self._wake.wait()
+            self._wake.clear()
+
+            # Drain everything queued since the last wakeup
+            while self.output_queue:
+                try:
+                    item = self.output_queue.popleft()
+
+                    # Check for sentinel value
+                    if item is None:
+                        return
+
+                    # Handle both old format (string) and new format (tuple)
+                    if isinstance(item, tuple):
+                        text, enable_correction, completion_event = item
+                    else:
+                        text, enable_correction, completion_event = item, False, None
+
+                    # Type the text with optional correction; always
+                    # release any waiter, even if typing raised
+                    try:
+                        self._type_text_with_correction(text, enable_correction)
+                    finally:
+                        if completion_event:
+                            completion_event.set()
+
+                except Exception as e:
+                    error(f"Output loop error: {e}")
+                    if self.on_error:
+                        self.on_error(f"Output error: {e}")
 
     def _type_text_with_correction(self, text: str, enable_correction: bool):
         """
@@ -187,34 +295,97 @@ class KeyboardOutput:
         # Update previous text
         self.previous_text = text
 
-    def _delete_characters(self, count: int):
+    def _send_command(self, command: str) -> bool:
         """
-        Delete characters by sending BackSpace keys.
+        Send a key command line to xdotool.
+
+        Uses the persistent script-mode process when running (no fork/exec
+        per command), falling back to a one-shot subprocess otherwise.
+        Script mode tokenizes on whitespace with no unquoting, so this
+        must only be used for commands whose arguments contain no spaces
+        (key names); free text goes through _run_xdotool instead.
 
         Args:
-            count: Number of characters to delete
-        """
-        if count <= 0:
-            return
+            command: xdotool command line (e.g. "key -- BackSpace")
 
+        Returns:
+            True if the command was sent successfully
+        """
         try:
-            # Send BackSpace keys (like nerd-dictation does)
-            cmd = ['xdotool', 'key', '--'] + ['BackSpace'] * count
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            if self.proc and self.proc.poll() is None:
+                # os.write may write fewer bytes than asked once the
+                # command exceeds PIPE_BUF; loop so a line is never split
+                data = command.encode('utf-8') + b'\n'
+                while data:
+                    written = os.write(self._proc_fd, data)
+                    data = data[written:]
+                return True
+
+            # Fallback: one-shot invocation (e.g. type_immediate before start)
+            return self._run_xdotool(shlex.split(command))
+
+        except Exception as e:
+            error_msg = f"Failed to send xdotool command: {e}"
+            error(error_msg)
+            if self.on_error:
+                self.on_error(error_msg)
+            return False
+
+    def _run_xdotool(self, args: list) -> bool:
+        """
+        Run xdotool once with an argv list.
 
+        Arguments are passed through exec directly, so text containing
+        spaces or quotes arrives as a single untouched argument.
+
+        Args:
+            args: xdotool arguments (e.g. ['type', '--', 'hello world'])
+
+        Returns:
+            True if xdotool exited successfully
+        """
+        try:
+            result = subprocess.run(['xdotool'] + args,
+                                    capture_output=True, text=True)
             if result.returncode != 0:
-                error_msg = f"xdotool delete failed: {result.stderr}"
+                error_msg = f"xdotool failed: {result.stderr}"
                 error(error_msg)
                 if self.on_error:
                     self.on_error(error_msg)
-            else:
-                debug(f"Deleted {count} characters")
+                return False
+            return True
 
         except Exception as e:
-            error_msg = f"Failed to delete characters: {e}"
+            error_msg = f"Failed to run xdotool: {e}"
             error(error_msg)
             if self.on_error:
                 self.on_error(error_msg)
+            return False
+
+    def _delete_characters(self, count: int):
+        """
+        Delete characters by sending BackSpace keys.
+
+        Args:
+            count: Number of characters to delete
+        """
+        if count <= 0:
+            return
+
+        if self.xdo is not None:
+            try:
+                for _ in range(count):
+                    self.xdo.send_keysequence_window(0, b'BackSpace')
+                debug("Deleted %d characters", count)
+            except Exception as e:
+                error(f"libxdo delete failed: {e}")
+                if self.on_error:
+                    self.on_error(f"Delete error: {e}")
+            return
+
+        # Send BackSpace keys (like nerd-dictation does)
+        if self._send_command('key -- ' + ' '.join(['BackSpace'] * count)):
+            debug("Deleted %d characters", count)
 
     def _type_text_immediate(self, text: str):
         """
@@ -226,31 +397,29 @@ class KeyboardOutput:
         if not text.strip():
             return  # Skip empty text
 
-        try:
-            # Clear any held modifier keys if enabled
-            if self.clear_modifiers:
-                self._clear_modifiers()
-
-            # Use xdotool to type the text
-            # --clearmodifiers ensures no modifier keys interfere
-            # -- prevents xdotool from interpreting options in the text
-            cmd = ['xdotool', 'type', '--clearmodifiers', '--', text]
-
-            result = subprocess.run(cmd, capture_output=True, text=True)
-
-            if result.returncode != 0:
-                error_msg = f"xdotool failed: {result.stderr}"
-                error(error_msg)
+        if self.xdo is not None:
+            try:
+                # Direct XTEST call via libxdo (delay is in microseconds)
+                self.xdo.enter_text_window(0, text.encode('utf-8'),
+                                           delay=int(self.typing_delay * 1e6))
+                debug("Typed text: '%s'", text)
+            except Exception as e:
+                error(f"libxdo type failed: {e}")
                 if self.on_error:
-                    self.on_error(error_msg)
-            else:
-                debug(f"Typed text: '{text}'")
+                    self.on_error(f"Type error: {e}")
+            return
 
-        except Exception as e:
-            error_msg = f"Failed to type text: {e}"
-            error(error_msg)
-            if self.on_error:
-                self.on_error(error_msg)
+        # No manual modifier clearing here: the type command below already
+        # passes --clearmodifiers, which releases held modifiers atomically
+        # without spawning one keyup per modifier.
+
+        # --clearmodifiers ensures no modifier keys interfere
+        # -- prevents xdotool from interpreting options in the text
+        # One-shot argv call: the text travels as a single argument, which
+        # the persistent script-mode pipe cannot guarantee (it splits
+        # lines on whitespace without unquoting)
+        if self._run_xdotool(['type', '--clearmodifiers', '--', text]):
+            debug("Typed text: '%s'", text)
 
     def _clear_modifiers(self):
         """Clear any held modifier keys."""
@@ -290,14 +459,18 @@ class KeyboardOutput:
             error("Cannot press key: xdotool not available")
             return
 
-        try:
-            subprocess.run(['xdotool', 'key', key],
-                          capture_output=True, check=True)
-            debug(f"Pressed key: {key}")
-        except Exception as e:
-            error(f"Failed to press key {key}: {e}")
-            if self.on_error:
-                self.on_error(f"Key press error: {e}")
+        if self.xdo is not None:
+            try:
+                self.xdo.send_keysequence_window(0, key.encode())
+                debug("Pressed key: %s", key)
+            except Exception as e:
+                error(f"Failed to press key {key}: {e}")
+                if self.on_error:
+                    self.on_error(f"Key press error: {e}")
+            return
+
+        if self._send_command(f'key {key}'):
+            debug("Pressed key: %s", key)
 
     def reset_correction_state(self):
         """
@@ -322,12 +495,10 @@ class KeyboardOutput:
             'error': None
         }
 
-        # Check xdotool
-        try:
-            subprocess.run(['xdotool', '--version'],
-                          capture_output=True, check=True)
+        # Check xdotool (in-process libxdo counts as available)
+        if self.xdo is not None or _xdotool_available():
             status['xdotool'] = True
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        else:
             status['error'] = "xdotool not found. Install with: sudo apt install xdotool"
 
         # Check display
@@ -369,6 +540,14 @@ class TextProcessor:
             ' eh ': ' ',
         }
 
+        # Single-pass replacement regex: one linear scan over the text
+        # instead of one str.replace() scan per pattern. Longest keys
+        # first so overlapping patterns match correctly.
+        self._replacements_regex = re.compile(
+            '|'.join(re.escape(key) for key in
+                     sorted(self.text_replacements, key=len, reverse=True))
+        )
+
         # Punctuation commands (spoken words to actual punctuation)
         self.punctuation_map = {
             'period': '.',
@@ -382,6 +561,34 @@ class TextProcessor:
             'paragraph': '\n\n',
         }
 
+        # Spoken-punctuation regex: matches a standalone command word along
+        # with the whitespace before it, so the substitution attaches the
+        # punctuation to the preceding word in the same pass (no
+        # split/join roundtrip). Longest keys first so 'question mark'
+        # wins over a hypothetical shorter prefix.
+        self._punctuation_regex = re.compile(
+            r'(?:^|\s+)(' +
+            '|'.join(re.escape(key) for key in
+                     sorted(self.punctuation_map, key=len, reverse=True)) +
+            r')(?=\s|$)',
+            re.IGNORECASE
+        )
+
+        # Whitespace normalization: collapse runs to a single space but
+        # keep newlines, since 'new line'/'paragraph' above emit them
+        self._whitespace_regex = re.compile(r'[^\S\n]+')
+        # Spaces hugging a newline are left over from the spoken command
+        # ("hello new line world" -> "hello\n world"); strip them
+        self._newline_space_regex = re.compile(r' *\n *')
+
+        # Memo cache: the replacement tables above are fixed for the
+        # lifetime of the instance, so processing is a pure function of
+        # the input and repeated chunks ("yes", "ok", fillers) can skip
+        # the regex passes entirely. Cleared wholesale when full -
+        # recomputing 1024 short strings is cheaper than LRU bookkeeping.
+        self._cache: dict = {}
+        self._cache_max = 1024
+
     def process_text(self, text: str) -> str:
         """
         Process transcribed text before output.
@@ -395,44 +602,41 @@ class TextProcessor:
         if not text:
             return text
 
-        debug(f"Text processing - Input: '{text}'")
+        cached = self._cache.get(text)
+        if cached is not None:
+            return cached
+
+        # %-style args defer formatting until the debug gate passes;
+        # this runs on every transcription
+        debug("Text processing - Input: '%s'", text)
 
         # First, normalize punctuation spacing (Whisper often doesn't add spaces)
         processed = self._normalize_punctuation_spacing(text)
-        debug(f"Text processing - After normalization: '{processed}'")
+        debug("Text processing - After normalization: '%s'", processed)
 
         # DON'T convert to lowercase - Whisper's capitalization is usually correct
         # Only apply specific text replacements that need case changes
 
-        # Apply text replacements (case-sensitive)
-        for old, new in self.text_replacements.items():
-            processed = processed.replace(old, new)
+        # Apply text replacements (case-sensitive) in a single pass
+        processed = self._replacements_regex.sub(
+            lambda m: self.text_replacements[m.group(0)], processed)
 
         # Handle punctuation commands (spoken words to actual punctuation)
-        # These need to be checked in lowercase
-        words = processed.split()
-        i = 0
-        while i < len(words):
-            word_lower = words[i].lower()
-            if word_lower in self.punctuation_map:
-                # Replace punctuation command with actual punctuation
-                # Try to combine with previous word
-                if i > 0 and len(words[i-1]) > 0:
-                    words[i-1] += self.punctuation_map[word_lower]
-                    words.pop(i)
-                else:
-                    words[i] = self.punctuation_map[word_lower]
-                    i += 1
-            else:
-                i += 1
+        # in one regex pass - the preceding whitespace is consumed by the
+        # match, so no word splitting or rejoining is needed
+        processed = self._punctuation_regex.sub(
+            lambda m: self.punctuation_map[m.group(1).lower()], processed)
+        debug("Text processing - After replacements: '%s'", processed)
 
-        processed = ' '.join(words)
-        debug(f"Text processing - After replacements: '{processed}'")
+        # Clean up extra spaces (newlines survive the collapse)
+        processed = self._whitespace_regex.sub(' ', processed)
+        processed = self._newline_space_regex.sub('\n', processed).strip()
 
-        # Clean up extra spaces
-        processed = ' '.join(processed.split())
+        debug("Text processing - Final output: '%s'", processed)
 
-        debug(f"Text processing - Final output: '{processed}'")
+        if len(self._cache) >= self._cache_max:
+            self._cache.clear()
+        self._cache[text] = processed
         return processed
 
     def _normalize_punctuation_spacing(self, text: str) -> str:
@@ -446,8 +650,6 @@ class TextProcessor:
         Returns:
             Text with proper spacing after punctuation
         """
-        import re
-
         original = text
 
         # Add space after sentence-ending punctuation if followed by any character (including ¿¡)
@@ -455,26 +657,26 @@ class TextProcessor:
         before = text
         text = re.sub(r'([.!?])([A-ZÑÁÉÍÓÚÜa-zñáéíóúü¿¡])', r'\1 \2', text)
         if text != before:
-            debug(f"Normalization - After punctuation+letter: '{before}' → '{text}'")
+            debug("Normalization - After punctuation+letter: '%s' → '%s'", before, text)
 
         # Add space after commas if followed by a letter
         before = text
         text = re.sub(r'(,)([A-Za-zÑñÁÉÍÓÚÜáéíóúü])', r'\1 \2', text)
         if text != before:
-            debug(f"Normalization - After comma+letter: '{before}' → '{text}'")
+            debug("Normalization - After comma+letter: '%s' → '%s'", before, text)
 
         # Add space after colons and semicolons if followed by a letter
         before = text
         text = re.sub(r'([;:])([A-Za-zÑñÁÉÍÓÚÜáéíóúü])', r'\1 \2', text)
         if text != before:
-            debug(f"Normalization - After colon/semicolon+letter: '{before}' → '{text}'")
+            debug("Normalization - After colon/semicolon+letter: '%s' → '%s'", before, text)
 
         # Handle cases where uppercase letter directly follows lowercase (word boundaries)
         # Handles: listoEra → listo Era, gastrosQue → gastros Que, tantasPuntadas → tantas Puntadas
         before = text
         text = re.sub(r'([a-zñáéíóúü])([A-ZÑÁÉÍÓÚÜ])', r'\1 \2', text)
         if text != before:
-            debug(f"Normalization - After lowercase+uppercase: '{before}' → '{text}'")
+            debug("Normalization - After lowercase+uppercase: '%s' → '%s'", before, text)
 
         if text != original:
             info(f"Punctuation normalization applied: '{original}' → '{text}'")
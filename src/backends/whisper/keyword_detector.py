@@ -8,27 +8,72 @@ import re
 import string
 from typing import Optional
 from dataclasses import dataclass
-from enum import Enum
+from enum import IntEnum
 
 from src.core.logging_controller import info, debug, warning, error, critical
 
-
-class DetectionMode(Enum):
-    """Detection state enumeration"""
-    NORMAL = "normal"
-    COMMAND_ACTIVE = "command_active"
-
-
-@dataclass
+# Optional: google-re2 DFA engine for the keyword patterns. Runs in
+# guaranteed O(n) with no backtracking; the patterns here are pure
+# regular languages so it is a drop-in replacement for stdlib re.
+try:
+    import re2 as _regex
+    RE2_AVAILABLE = True
+except ImportError:
+    _regex = re
+    RE2_AVAILABLE = False
+
+# Optional: Aho-Corasick multi-pattern matcher. With several wake-word
+# aliases configured it scans the text once (O(text)) instead of running
+# one regex per alias; with a single keyword the regex path is cheaper.
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    ahocorasick = None
+    AHOCORASICK_AVAILABLE = False
+
+# Characters stripped around commands ("tony, enter" == "tony enter")
+_STRIP_CHARS = string.punctuation + string.whitespace
+
+# Filler words ignored at the start of a command ("tony um enter")
+_FILLER_WORDS = frozenset({'um', 'uh', 'eh', 'the', 'a', 'an'})
+
+# Confidence multipliers per sensitivity setting
+_SENSITIVITY_MULTIPLIERS = {
+    'low': 0.9,
+    'normal': 1.0,
+    'high': 1.1
+}
+
+
+class DetectionMode(IntEnum):
+    """Detection state enumeration.
+
+    IntEnum so mode comparisons are C-level int compares; members are
+    singletons, so the hot path tests them with ``is``.
+    """
+    NORMAL = 0
+    COMMAND_ACTIVE = 1
+
+
+@dataclass(slots=True)
 class DetectionResult:
     """Result of keyword detection"""
     detected_keyword: bool
     command_candidate: Optional[str] = None
     remaining_text: Optional[str] = None  # Text after command to be typed
+    text_before: Optional[str] = None  # Original-case text before the keyword
     confidence: float = 0.0
     mode: DetectionMode = DetectionMode.NORMAL
 
 
+# Shared negative results for the hot idle path: process_text runs on
+# every transcription chunk and usually detects nothing, so avoid
+# allocating a fresh DetectionResult each time. Never mutate these.
+_NEG_NORMAL = DetectionResult(detected_keyword=False, mode=DetectionMode.NORMAL)
+_NEG_ACTIVE = DetectionResult(detected_keyword=False, mode=DetectionMode.COMMAND_ACTIVE)
+
+
 class KeywordDetector:
     """Detects activation keywords in transcribed text"""
 
@@ -38,7 +83,8 @@ class KeywordDetector:
                  sensitivity: str = "normal",
                  language: str = "es",
                  max_command_words: int = 1,
-                 command_registry=None):
+                 command_registry=None,
+                 keyword_aliases: Optional[list] = None):
         """
         Initialize keyword detector.
 
@@ -49,30 +95,84 @@ class KeywordDetector:
             language: Language code
             max_command_words: Maximum words to analyze for command (1-5)
             command_registry: CommandRegistry instance for multi-word lookup
+            keyword_aliases: Extra wake words treated like the keyword
+                (e.g. ["hey tony", "computer"]); matched via a single
+                Aho-Corasick scan when pyahocorasick is installed
         """
         self.keyword = keyword.lower().strip()
+        self._aliases = []
+        for alias in (keyword_aliases or []):
+            alias = alias.lower().strip()
+            if alias and alias != self.keyword and alias not in self._aliases:
+                self._aliases.append(alias)
+        self.keywords = [self.keyword] + self._aliases
         self.timeout_seconds = timeout_seconds
         self.sensitivity = sensitivity
         self.language = language
         self.max_command_words = max(1, min(5, max_command_words))  # Limit 1-5
         self.command_registry = command_registry
 
-        # State management
+        # State management. The command deadline is a monotonic-clock
+        # timestamp: immune to NTP/wall-clock jumps, and storing the
+        # deadline (rather than the detection time) saves a subtraction
+        # on every timeout check.
         self.current_mode = DetectionMode.NORMAL
-        self.keyword_detected_time: Optional[float] = None
+        self._command_deadline: Optional[float] = None
         self.last_text = ""
 
         # Compile regex patterns for efficiency
         self._compile_patterns()
 
+    @property
+    def sensitivity(self) -> str:
+        """Detection sensitivity (low/normal/high)"""
+        return self._sensitivity
+
+    @sensitivity.setter
+    def sensitivity(self, value: str):
+        self._sensitivity = value
+        # Precompute the sensitivity-adjusted base so each detection
+        # does a single addition instead of a lookup and multiply
+        self._base_confidence = 0.8 * _SENSITIVITY_MULTIPLIERS.get(value, 1.0)
+
     def _compile_patterns(self):
         """Compile regex patterns for keyword detection"""
-        # Pattern to match keyword (case-insensitive, word boundaries)
-        keyword_pattern = r'\b' + re.escape(self.keyword) + r'\b'
-        self.keyword_regex = re.compile(keyword_pattern, re.IGNORECASE)
+        # Pattern to match any wake word (case-insensitive, word boundaries)
+        alternation = '|'.join(re.escape(kw) for kw in self.keywords)
+        self.keyword_regex = _regex.compile(
+            r'\b(?:' + alternation + r')\b', _regex.IGNORECASE)
+
+        # Plain keywords allow a C-level substring early-out before the
+        # regex; only valid when every wake word is a plain word
+        self._keywords_are_plain = all(kw.isalnum() for kw in self.keywords)
+
+        # Fast path for the common "keyword first" utterance shape
+        self._keyword_prefixes = tuple((kw, kw + ' ') for kw in self.keywords)
+
+        # Fused pattern: finds any wake word and captures everything
+        # after it (leading separators consumed) in a single traversal
+        self._kw_cmd_regex = _regex.compile(
+            r'\b(?:' + alternation + r')\b\W*(.*)', _regex.IGNORECASE)
 
         # Pattern for command detection (single word after keyword)
-        self.command_regex = re.compile(r'\b(\w+)\b', re.IGNORECASE)
+        self.command_regex = _regex.compile(r'\b(\w+)\b', _regex.IGNORECASE)
+
+        # Strips any run of leading filler words in one C-level pass,
+        # replacing a per-word Python membership loop
+        self._filler_prefix_regex = _regex.compile(
+            r'^(?:(?:' + '|'.join(sorted(_FILLER_WORDS)) + r')\b\W*)+')
+
+        # With several wake words an Aho-Corasick automaton finds all of
+        # them in one O(text) scan instead of a regex pass per alias;
+        # for a single keyword the regex path is already cheaper
+        if AHOCORASICK_AVAILABLE and len(self.keywords) > 1:
+            automaton = ahocorasick.Automaton()
+            for kw in self.keywords:
+                automaton.add_word(kw, kw)
+            automaton.make_automaton()
+            self._keyword_automaton = automaton
+        else:
+            self._keyword_automaton = None
 
     def process_text(self, text: str) -> DetectionResult:
         """
@@ -84,77 +184,103 @@ class KeywordDetector:
         Returns:
             DetectionResult with detection status
         """
-        text_clean = text.lower().strip()
-        current_time = time.time()
+        text_stripped = text.strip()
+        text_clean = text_stripped.lower()
+        current_time = time.monotonic()
 
-        debug(f"Processing text: '{text_clean}', current mode: {self.current_mode}")
+        # %-style args defer the formatting (including the Enum repr)
+        # until the debug gate passes; this runs on every chunk
+        debug("Processing text: '%s', current mode: %s", text_clean, self.current_mode)
 
         # Check for command timeout
-        if self.current_mode == DetectionMode.COMMAND_ACTIVE:
-            if current_time - self.keyword_detected_time > self.timeout_seconds:
+        if self.current_mode is DetectionMode.COMMAND_ACTIVE:
+            if current_time > self._command_deadline:
                 debug("Command timeout, returning to normal mode")
                 self._reset_to_normal()
-                return DetectionResult(detected_keyword=False, mode=DetectionMode.NORMAL)
+                return _NEG_NORMAL
 
         # Check for keyword in normal mode
-        if self.current_mode == DetectionMode.NORMAL:
-            if self._detect_keyword(text_clean):
+        if self.current_mode is DetectionMode.NORMAL:
+            # Fast path: most command utterances start with a wake word
+            # itself, where a C-level startswith beats the regex entirely
+            text_before = None
+            after_keyword_text = None
+            for kw, kw_with_space in self._keyword_prefixes:
+                if text_clean == kw or text_clean.startswith(kw_with_space):
+                    after_keyword_text = text_clean[len(kw):]
+                    break
+
+            if after_keyword_text is None:
+                # Cheap gate before the regex machinery: one automaton
+                # scan covers every wake word when pyahocorasick is
+                # installed; otherwise a substring check per keyword
+                if self._keyword_automaton is not None:
+                    if not self._automaton_hits(text_clean):
+                        return _NEG_NORMAL
+                elif self._keywords_are_plain and not any(
+                        kw in text_clean for kw in self.keywords):
+                    return _NEG_NORMAL
+
+                # One fused traversal: wake-word position, the text before
+                # it and the text after it come out of the same search
+                keyword_match = self._kw_cmd_regex.search(text_clean)
+                if keyword_match:
+                    after_keyword_text = keyword_match.group(1)
+                    # Slice the original-case string with the match
+                    # indices so capitalization survives for typing
+                    text_before = text_stripped[:keyword_match.start()].strip() or None
+
+            if after_keyword_text is not None:
                 info(f"Keyword detected: '{self.keyword}'")
                 self.current_mode = DetectionMode.COMMAND_ACTIVE
-                self.keyword_detected_time = current_time
+                self._command_deadline = current_time + self.timeout_seconds
 
                 # Look for command immediately after keyword
-                result = self._extract_command_with_remaining(text_clean, after_keyword=True)
+                result = self._extract_multiword_command(
+                    self._strip_punctuation_and_whitespace(after_keyword_text))
                 if result and result['command']:
-                    return self._process_command(result['command'], result.get('remaining_text'))
+                    return self._process_command(result['command'], result.get('remaining_text'),
+                                                 text_before)
                 else:
                     return DetectionResult(
                         detected_keyword=True,
+                        text_before=text_before,
                         mode=DetectionMode.COMMAND_ACTIVE,
                         confidence=self._calculate_confidence(text_clean)
                     )
 
         # Check for command in active mode
-        elif self.current_mode == DetectionMode.COMMAND_ACTIVE:
-            result = self._extract_command_with_remaining(text_clean, after_keyword=False)
+        elif self.current_mode is DetectionMode.COMMAND_ACTIVE:
+            result = self._extract_command_with_remaining(text_clean)
             if result and result['command']:
                 return self._process_command(result['command'], result.get('remaining_text'))
 
         # No detection
-        return DetectionResult(detected_keyword=False, mode=self.current_mode)
+        if self.current_mode is DetectionMode.COMMAND_ACTIVE:
+            return _NEG_ACTIVE
+        return _NEG_NORMAL
+
+    def _automaton_hits(self, text: str) -> bool:
+        """Check whether any wake word occurs in text (substring level).
 
-    def _detect_keyword(self, text: str) -> bool:
-        """Detect if keyword is present in text"""
-        matches = self.keyword_regex.findall(text)
-        return len(matches) > 0
+        Used as a cheap gate before the word-boundary regex, so matches
+        inside longer words are acceptable here - the regex rejects them.
+        """
+        for _ in self._keyword_automaton.iter(text):
+            return True
+        return False
 
-    def _extract_command_with_remaining(self, text: str, after_keyword: bool = False) -> Optional[dict]:
+    def _extract_command_with_remaining(self, text: str) -> Optional[dict]:
         """
-        Extract command and remaining text.
+        Extract command and remaining text from full text.
 
         Args:
             text: Text to process
-            after_keyword: If True, extract command after keyword position
 
         Returns:
             Dictionary with 'command' and 'remaining_text', or None
         """
-        if after_keyword:
-            # Find keyword position
-            keyword_match = self.keyword_regex.search(text)
-            if not keyword_match:
-                return None
-
-            # Look for command after keyword
-            after_keyword_text = text[keyword_match.end():]
-            # Strip both whitespace AND punctuation
-            after_keyword_text = self._strip_punctuation_and_whitespace(after_keyword_text)
-
-            # Extract command with multi-word support
-            return self._extract_multiword_command(after_keyword_text)
-        else:
-            # Extract from full text
-            return self._extract_multiword_command(text)
+        return self._extract_multiword_command(text)
 
     def _extract_multiword_command(self, text: str) -> Optional[dict]:
         """
@@ -176,39 +302,31 @@ class KeywordDetector:
                 return {'command': words[0], 'remaining_text': ' '.join(words[1:]) if len(words) > 1 else None}
             return None
 
-        # Extract words
-        words = text.split()
-        if not words:
-            return None
-
-        # Remove filler words from the beginning
-        filler_words = {'um', 'uh', 'eh', 'the', 'a', 'an'}
-        while words and words[0].lower() in filler_words:
-            words.pop(0)
+        # Drop leading filler words ("tony um enter"; text is already
+        # lowercase upstream), then split once
+        text = self._filler_prefix_regex.sub('', text, count=1)
 
+        words = text.split()
         if not words:
             return None
 
-        # Try to find command with cascading word count
-        # Start with max_command_words, then reduce until match found
+        # Walk the registry's command trie: one pass over the words,
+        # keeping the longest registered command (no cascading joins)
         max_words = min(self.max_command_words, len(words))
 
-        for num_words in range(max_words, 0, -1):
-            # Build candidate command (join first num_words words)
-            command_candidate = ' '.join(words[:num_words]).lower()
-
-            # Check if this command exists in registry
-            if self.command_registry.get_command(command_candidate):
-                info(f"Found multi-word command: '{command_candidate}' ({num_words} words)")
-                remaining_words = words[num_words:]
-                remaining_text = ' '.join(remaining_words) if remaining_words else None
-                return {
-                    'command': command_candidate,
-                    'remaining_text': remaining_text
-                }
+        match = self.command_registry.find_longest_command(words, max_words)
+        if match:
+            command_candidate, num_words = match
+            info(f"Found multi-word command: '{command_candidate}' ({num_words} words)")
+            remaining_words = words[num_words:]
+            remaining_text = ' '.join(remaining_words) if remaining_words else None
+            return {
+                'command': command_candidate,
+                'remaining_text': remaining_text
+            }
 
         # No command found - return None (all text will be typed)
-        debug(f"No command found in first {max_words} words, text will be typed")
+        debug("No command found in first %d words, text will be typed", max_words)
         return None
 
     def _extract_command(self, text: str) -> Optional[str]:
@@ -218,7 +336,8 @@ class KeywordDetector:
             return result['command']
         return None
 
-    def _process_command(self, command: str, remaining_text: Optional[str] = None) -> DetectionResult:
+    def _process_command(self, command: str, remaining_text: Optional[str] = None,
+                         text_before: Optional[str] = None) -> DetectionResult:
         """Process detected command"""
         if remaining_text:
             info(f"Command detected: '{command}', remaining text: '{remaining_text}'")
@@ -230,59 +349,43 @@ class KeywordDetector:
             detected_keyword=True,
             command_candidate=command,
             remaining_text=remaining_text,
+            text_before=text_before,
             confidence=self._calculate_confidence(command),
             mode=DetectionMode.NORMAL
         )
 
     def _calculate_confidence(self, text: str) -> float:
         """Calculate confidence score for detection"""
-        base_confidence = 0.8
+        # Adjust based on text clarity (no filler words, clear speech);
+        # a single-word check needs no split-list allocation
+        clarity_bonus = 0.1 if ' ' not in text else 0.0
 
-        # Adjust based on sensitivity
-        sensitivity_multiplier = {
-            'low': 0.9,
-            'normal': 1.0,
-            'high': 1.1
-        }.get(self.sensitivity, 1.0)
-
-        # Adjust based on text clarity (no filler words, clear speech)
-        clarity_bonus = 0.1 if len(text.split()) == 1 else 0.0
-
-        confidence = min(1.0, base_confidence * sensitivity_multiplier + clarity_bonus)
-        return confidence
+        # Base confidence pre-scaled by sensitivity (see sensitivity setter)
+        return min(1.0, self._base_confidence + clarity_bonus)
 
     def _strip_punctuation_and_whitespace(self, text: str) -> str:
         """
         Strip leading/trailing punctuation and whitespace from text.
         This ensures "tony, enter" and "tony,enter" work the same as "tony enter".
         """
-        # Strip from the left
-        while text and (text[0] in string.punctuation or text[0].isspace()):
-            text = text[1:]
-
-        # Strip from the right
-        while text and (text[-1] in string.punctuation or text[-1].isspace()):
-            text = text[:-1]
-
-        return text
+        # Single C-level pass instead of per-character slicing
+        return text.strip(_STRIP_CHARS)
 
     def _reset_to_normal(self):
         """Reset detector to normal mode"""
         self.current_mode = DetectionMode.NORMAL
-        self.keyword_detected_time = None
+        self._command_deadline = None
 
     def is_command_mode_active(self) -> bool:
         """Check if command mode is currently active"""
-        return self.current_mode == DetectionMode.COMMAND_ACTIVE
+        return self.current_mode is DetectionMode.COMMAND_ACTIVE
 
     def get_remaining_timeout(self) -> float:
         """Get remaining time before command timeout"""
-        if not self.keyword_detected_time:
+        if not self._command_deadline:
             return 0.0
 
-        elapsed = time.time() - self.keyword_detected_time
-        remaining = max(0.0, self.timeout_seconds - elapsed)
-        return remaining
+        return max(0.0, self._command_deadline - time.monotonic())
 
     def reset(self):
         """Reset detector to initial state"""
@@ -291,8 +394,14 @@ class KeywordDetector:
 
     def update_keyword(self, keyword: str):
         """Update the activation keyword"""
-        self.keyword = keyword.lower().strip()
-        self._compile_patterns()
+        new_keyword = keyword.lower().strip()
+        if new_keyword != self.keyword:
+            # Only recompile the patterns when the keyword actually
+            # changed; configured aliases stay active
+            self.keyword = new_keyword
+            self.keywords = [new_keyword] + [a for a in self._aliases
+                                             if a != new_keyword]
+            self._compile_patterns()
         self.reset()
         info(f"Keyword updated to: '{self.keyword}'")
 
@@ -5,10 +5,12 @@ Provides high-performance speech transcription using faster-whisper
 with GPU acceleration for real-time dictation.
 """
 
+import ctypes
 import threading
 import queue
 import time
-from typing import Optional, Callable, Dict, Any
+from dataclasses import dataclass, field
+from typing import Optional, Callable, Dict, Any, List
 import numpy as np
 
 from src.core.logging_controller import info, debug, warning, error, critical
@@ -21,6 +23,50 @@ except ImportError:
     FASTER_WHISPER_AVAILABLE = False
     warning("faster-whisper not available, install with: pip install faster-whisper")
 
+# Optional: batched pipeline (faster-whisper >= 1.0) decodes the VAD
+# segments of one long input in parallel instead of sequentially
+try:
+    from faster_whisper import BatchedInferencePipeline
+except ImportError:
+    BatchedInferencePipeline = None
+
+# Optional: cuda-python for pinned host memory. Pinned staging buffers
+# roughly double host-to-device bandwidth versus pageable numpy arrays.
+try:
+    from cuda import cudart
+    CUDA_PYTHON_AVAILABLE = True
+except ImportError:
+    cudart = None
+    CUDA_PYTHON_AVAILABLE = False
+
+# Size of the pinned audio staging buffer (30s at 16kHz float32)
+_PINNED_BUFFER_SAMPLES = 30 * 16000
+
+# Compute types CTranslate2 accepts
+_VALID_COMPUTE_TYPES = {
+    'int8', 'int8_float16', 'int8_bfloat16', 'int16',
+    'float16', 'bfloat16', 'float32', 'auto', 'default'
+}
+
+
+@dataclass(slots=True)
+class TranscriptionResult:
+    """Result of one transcribe() call.
+
+    Slotted dataclass instead of a dict: attribute access skips key
+    hashing and each instance is a fraction of a dict's footprint,
+    which matters when batching produces results in bursts.
+    """
+    text: str
+    language: Optional[str]
+    language_probability: Optional[float]
+    duration: float
+    transcription_time: float
+    real_time_factor: float
+    avg_confidence: Optional[float] = None
+    word_timestamps: List[Dict[str, Any]] = field(default_factory=list)
+    segments: List[Dict[str, Any]] = field(default_factory=list)
+
 
 class WhisperTranscriber:
     """
@@ -32,33 +78,89 @@ class WhisperTranscriber:
     def __init__(self,
                  model_size: str = "medium",
                  device: str = "cuda",
-                 compute_type: str = "float16",
-                 language: Optional[str] = None):
+                 compute_type: Optional[str] = None,
+                 language: Optional[str] = None,
+                 silence_threshold: float = 0.01,
+                 cpu_threads: int = 0,
+                 num_workers: int = 1):
         """
         Initialize Whisper transcriber.
 
         Args:
             model_size: Whisper model size (tiny, base, small, medium, large)
             device: Device to use (cuda or cpu)
-            compute_type: Compute precision (float16 for GPU, float32 for CPU)
+            compute_type: Compute precision. Defaults to int8_float16 on
+                GPU (INT8 weight GEMM, FP16 activations) and int8 on CPU;
+                the quantized types roughly halve weight bandwidth and
+                VRAM for a typically <0.5% WER cost.
             language: Default language code (e.g., 'en', 'es')
+            silence_threshold: Peak amplitude below which audio is treated
+                as silence and skipped without running the model
+            cpu_threads: CTranslate2 intra-op threads for CPU inference
+                (0 lets CTranslate2 decide)
+            num_workers: CTranslate2 worker count for concurrent calls
         """
         if not FASTER_WHISPER_AVAILABLE:
             raise ImportError("faster-whisper is required. Install with: pip install faster-whisper")
 
+        if compute_type is None:
+            compute_type = "int8_float16" if device == "cuda" else "int8"
+        elif compute_type not in _VALID_COMPUTE_TYPES:
+            warning(f"Unknown compute_type '{compute_type}', using 'auto'")
+            compute_type = "auto"
+
         self.model_size = model_size
         self.device = device
         self.compute_type = compute_type
         self.default_language = language
+        self.silence_threshold = silence_threshold
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers
+        self.min_audio_samples = int(0.2 * 16000)  # 200ms at 16kHz
 
         self.model: Optional[WhisperModel] = None
         self.is_model_loaded = False
         self.load_lock = threading.Lock()
 
-        # Transcription settings optimized for real-time dictation
-        self.beam_size = 5  # Balance between speed and accuracy
+        # Recently used models, keyed by (model_size, compute_type).
+        # Capped at two entries so toggling small<->medium skips the
+        # full CTranslate2 construction; unload_model drops everything.
+        self._model_cache: Dict[tuple, WhisperModel] = {}
+        self._model_cache_max = 2
+
+        # Pinned host staging buffer (allocated with the model on CUDA)
+        self._pinned_buffer: Optional[np.ndarray] = None
+        self._pinned_ptr: Optional[int] = None
+
+        # Transcription settings optimized for real-time dictation.
+        # Greedy decoding: on short single-speaker utterances beam=5
+        # costs ~5x the decode compute for virtually identical text; the
+        # temperature ladder re-decodes only low-confidence results.
+        self.beam_size = 1
         self.vad_filter = True  # Enable voice activity filter
-        self.temperature = 0.0  # Deterministic output
+        self.temperature = (0.0, 0.2, 0.4)
+        # Chunks are independent in this backend; conditioning on the
+        # previous text only propagates hallucination loops
+        self.condition_on_previous_text = False
+
+        # Batched decoding: inputs at least this long go through
+        # BatchedInferencePipeline, which decodes their VAD segments
+        # batch_size at a time instead of one after another. Short
+        # dictation chunks produce a single segment, where batching
+        # only adds overhead.
+        self.batch_size = 8
+        self.batch_min_duration = 8.0  # seconds
+        self._batched_model = None
+
+        # Run a dummy transcription right after load so cuBLAS heuristic
+        # selection and kernel autotuning happen before the first real
+        # utterance instead of inside it
+        self.warmup = True
+
+        # Silero VAD parameters, hoisted so the dict isn't rebuilt per call;
+        # trimming silence before the encoder is the biggest win for
+        # dictation with pauses (encoder cost scales with mel frames)
+        self.vad_parameters = {'min_silence_duration_ms': 500}
 
         # Performance tracking
         self.total_transcriptions = 0
@@ -76,6 +178,19 @@ class WhisperTranscriber:
             if self.is_model_loaded:
                 return True
 
+            # Cache hit: a previously released model with this exact
+            # configuration is still resident
+            cache_key = (self.model_size, self.device, self.compute_type)
+            cached = self._model_cache.pop(cache_key, None)
+            if cached is not None:
+                self.model = cached
+                self._model_cache[cache_key] = cached  # most recently used
+                if BatchedInferencePipeline is not None:
+                    self._batched_model = BatchedInferencePipeline(model=self.model)
+                self.is_model_loaded = True
+                info(f"Reusing cached Whisper model '{self.model_size}' ({self.compute_type})")
+                return True
+
             try:
                 info(f"Loading Whisper model '{self.model_size}' on {self.device}...")
                 start_time = time.time()
@@ -94,12 +209,53 @@ class WhisperTranscriber:
                 self.model = WhisperModel(
                     self.model_size,
                     device=self.device,
-                    compute_type=self.compute_type
+                    compute_type=self.compute_type,
+                    cpu_threads=self.cpu_threads,
+                    num_workers=self.num_workers
                 )
 
                 load_time = time.time() - start_time
                 info(f"Model loaded in {load_time:.2f} seconds on {self.device}")
                 self.is_model_loaded = True
+
+                # Remember the model for fast switching back; evict the
+                # least recently used entry beyond the cap
+                self._model_cache[cache_key] = self.model
+                while len(self._model_cache) > self._model_cache_max:
+                    _key, evicted = next(iter(self._model_cache.items()))
+                    del self._model_cache[_key]
+                    del evicted
+
+                if self.warmup:
+                    try:
+                        warm_start = time.time()
+                        segments, _info = self.model.transcribe(
+                            np.zeros(16000, dtype=np.float32),
+                            language='en', beam_size=1)
+                        for _segment in segments:
+                            pass  # generator only runs when consumed
+                        info(f"Warmup transcription took {time.time() - warm_start:.2f}s")
+                    except Exception as e:
+                        warning(f"Warmup transcription failed: {e}")
+
+                # Wrap for batched decoding of long inputs (shares the
+                # loaded weights, so this costs no extra memory)
+                if BatchedInferencePipeline is not None:
+                    self._batched_model = BatchedInferencePipeline(model=self.model)
+
+                # Allocate a pinned host buffer so audio reaches the GPU
+                # with full PCIe bandwidth instead of a pageable copy
+                if self.device == "cuda" and CUDA_PYTHON_AVAILABLE and self._pinned_buffer is None:
+                    try:
+                        err, ptr = cudart.cudaMallocHost(_PINNED_BUFFER_SAMPLES * 4)
+                        if err == cudart.cudaError_t.cudaSuccess:
+                            raw = (ctypes.c_float * _PINNED_BUFFER_SAMPLES).from_address(ptr)
+                            self._pinned_ptr = ptr
+                            self._pinned_buffer = np.frombuffer(raw, dtype=np.float32)
+                            info("Allocated pinned host buffer for audio transfers")
+                    except Exception as e:
+                        warning(f"Could not allocate pinned host buffer: {e}")
+
                 return True
 
             except Exception as e:
@@ -125,11 +281,38 @@ class WhisperTranscriber:
                 self.is_model_loaded = False
                 raise  # Re-raise the exception for better error handling upstream
 
+    def release_model(self):
+        """
+        Detach the current model without freeing it.
+
+        The model stays in the recently-used cache, so switching back to
+        this size/precision (see update_model_size) is instant instead
+        of a full CTranslate2 reconstruction. unload_model still frees
+        everything.
+        """
+        with self.load_lock:
+            self._batched_model = None
+            self.model = None
+            self.is_model_loaded = False
+
     def unload_model(self):
         """Unload model to free GPU memory."""
         import gc
         with self.load_lock:
+            # Release the pinned staging buffer together with the model
+            if self._pinned_ptr is not None:
+                try:
+                    cudart.cudaFreeHost(self._pinned_ptr)
+                except Exception:
+                    pass
+                self._pinned_ptr = None
+                self._pinned_buffer = None
+
+            # Cached models hold VRAM too; an unload frees them all
+            self._model_cache.clear()
+
             if self.model:
+                self._batched_model = None
                 del self.model
                 self.model = None
                 self.is_model_loaded = False
@@ -151,7 +334,8 @@ class WhisperTranscriber:
     def transcribe(self,
                    audio: np.ndarray,
                    language: Optional[str] = None,
-                   on_progress: Optional[Callable[[float], None]] = None) -> Optional[Dict[str, Any]]:
+                   on_progress: Optional[Callable[[float], None]] = None,
+                   word_timestamps: bool = False) -> Optional['TranscriptionResult']:
         """
         Transcribe audio array to text.
 
@@ -159,9 +343,12 @@ class WhisperTranscriber:
             audio: Numpy array of audio samples (float32, normalized)
             language: Language code (auto-detect if None)
             on_progress: Optional progress callback (0.0 to 1.0)
+            word_timestamps: Compute per-word timestamps/probabilities.
+                Off by default: token-level alignment costs 20-40% of
+                wall clock and dictation only consumes the text.
 
         Returns:
-            Dictionary with transcription results or None on error
+            TranscriptionResult, or None on error
         """
         if not self.is_model_loaded:
             if not self.load_model():
@@ -171,6 +358,20 @@ class WhisperTranscriber:
             warning("Empty audio array provided")
             return None
 
+        # Cheap silence gate: one vectorized peak reduction versus a full
+        # encoder pass for a chunk that cannot contain speech
+        peak = float(np.max(np.abs(audio)))
+        if peak < self.silence_threshold or len(audio) < self.min_audio_samples:
+            debug("Skipping silent/short chunk (peak=%.4f, samples=%d)", peak, len(audio))
+            return TranscriptionResult(
+                text='',
+                language=language or self.default_language,
+                language_probability=None,
+                duration=len(audio) / 16000.0,
+                transcription_time=0.0,
+                real_time_factor=0.0
+            )
+
         try:
             start_time = time.time()
             audio_duration = len(audio) / 16000.0  # Assuming 16kHz sample rate
@@ -178,28 +379,56 @@ class WhisperTranscriber:
             # Use specified language or default
             transcribe_language = language or self.default_language
 
-            debug(f"Transcribing {audio_duration:.2f}s of audio with language: {transcribe_language}")
+            # %-style args defer formatting until the debug gate passes
+            debug("Transcribing %.2fs of audio with language: %s",
+                  audio_duration, transcribe_language)
 
             # Run transcription
-            segments, info = self.model.transcribe(
-                audio,
-                language=transcribe_language,
-                beam_size=self.beam_size,
-                vad_filter=self.vad_filter,
-                temperature=self.temperature,
-                word_timestamps=True
-            )
+            # Stage the audio in the pinned buffer when it fits
+            if self._pinned_buffer is not None and len(audio) <= _PINNED_BUFFER_SAMPLES:
+                np.copyto(self._pinned_buffer[:len(audio)], audio)
+                audio_input = self._pinned_buffer[:len(audio)]
+            else:
+                audio_input = audio
+
+            if (self._batched_model is not None
+                    and audio_duration >= self.batch_min_duration):
+                # Long input (merged backlog): decode its VAD segments
+                # in parallel through the batched pipeline
+                segments, info = self._batched_model.transcribe(
+                    audio_input,
+                    language=transcribe_language,
+                    beam_size=self.beam_size,
+                    batch_size=self.batch_size,
+                    word_timestamps=word_timestamps
+                )
+            else:
+                segments, info = self.model.transcribe(
+                    audio_input,
+                    language=transcribe_language,
+                    beam_size=self.beam_size,
+                    vad_filter=self.vad_filter,
+                    vad_parameters=self.vad_parameters,
+                    temperature=self.temperature,
+                    condition_on_previous_text=self.condition_on_previous_text,
+                    word_timestamps=word_timestamps
+                )
 
-            # Collect all segments
+            # Collect everything in a single pass: segments is a lazy
+            # generator, so it can only be consumed once
             text_parts = []
-            word_timestamps = []
+            segments_out = []
+            word_timestamp_list = []
             confidence_scores = []
 
             for segment in segments:
                 text_parts.append(segment.text)
-                if segment.words:
+                segments_out.append({'text': segment.text,
+                                     'start': segment.start,
+                                     'end': segment.end})
+                if word_timestamps and segment.words:
                     for word in segment.words:
-                        word_timestamps.append({
+                        word_timestamp_list.append({
                             'word': word.word,
                             'start': word.start,
                             'end': word.end,
@@ -212,25 +441,30 @@ class WhisperTranscriber:
 
             # Calculate statistics
             transcription_time = time.time() - start_time
-            avg_confidence = np.mean(confidence_scores) if confidence_scores else None
+            if confidence_scores:
+                avg_confidence = float(np.fromiter(confidence_scores,
+                                                   dtype=np.float32).mean())
+            else:
+                avg_confidence = None
 
             self.total_transcriptions += 1
             self.total_audio_duration += audio_duration
             self.total_transcription_time += transcription_time
 
-            result = {
-                'text': full_text,
-                'language': info.language,
-                'language_probability': info.language_probability,
-                'duration': audio_duration,
-                'transcription_time': transcription_time,
-                'real_time_factor': transcription_time / audio_duration if audio_duration > 0 else 0,
-                'avg_confidence': avg_confidence,
-                'word_timestamps': word_timestamps,
-                'segments': [{'text': seg.text, 'start': seg.start, 'end': seg.end} for seg in segments]
-            }
+            result = TranscriptionResult(
+                text=full_text,
+                language=info.language,
+                language_probability=info.language_probability,
+                duration=audio_duration,
+                transcription_time=transcription_time,
+                real_time_factor=transcription_time / audio_duration if audio_duration > 0 else 0,
+                avg_confidence=avg_confidence,
+                word_timestamps=word_timestamp_list,
+                segments=segments_out
+            )
 
-            debug(f"Transcription: '{full_text}' (RTF: {result['real_time_factor']:.2f})")
+            debug("Transcription: '%s' (RTF: %.2f)",
+                  full_text, result.real_time_factor)
             return result
 
         except Exception as e:
@@ -303,10 +537,15 @@ class TranscriptionWorker:
     the audio capture thread.
     """
 
+    # Default cap on audio merged into one transcribe call (30s at
+    # 16kHz), bounding latency on bursty input
+    MAX_BATCH_SAMPLES = 30 * 16000
+
     def __init__(self,
                  transcriber: WhisperTranscriber,
-                 on_result: Callable[[Dict[str, Any]], None],
-                 on_error: Callable[[str], None]):
+                 on_result: Callable[['TranscriptionResult'], None],
+                 on_error: Callable[[str], None],
+                 max_batch_samples: Optional[int] = None):
         """
         Initialize transcription worker.
 
@@ -314,14 +553,23 @@ class TranscriptionWorker:
             transcriber: WhisperTranscriber instance
             on_result: Callback for successful transcription
             on_error: Callback for transcription errors
+            max_batch_samples: Cap on audio coalesced into a single
+                transcribe call when chunks are pending (defaults to
+                MAX_BATCH_SAMPLES, 30s at 16kHz)
         """
         self.transcriber = transcriber
         self.on_result = on_result
         self.on_error = on_error
+        self.max_batch_samples = max_batch_samples or self.MAX_BATCH_SAMPLES
 
-        self.audio_queue = queue.Queue()
+        # SimpleQueue skips Queue's condition-variable/task-tracking
+        # overhead; we only ever put and get
+        self.audio_queue = queue.SimpleQueue()
         self.is_running = False
-        self.worker_thread: Optional[threading.Thread] = None
+        # Named daemon thread: the loop blocks in SimpleQueue.get(), so
+        # it must not keep the interpreter alive if the app exits without
+        # calling stop()
+        self._thread: Optional[threading.Thread] = None
         self.current_language: Optional[str] = None
 
     def start(self, language: Optional[str] = None):
@@ -333,9 +581,9 @@ class TranscriptionWorker:
         self.is_running = True
         self.current_language = language
 
-        self.worker_thread = threading.Thread(target=self._worker_loop)
-        self.worker_thread.daemon = True
-        self.worker_thread.start()
+        self._thread = threading.Thread(target=self._worker_loop,
+                                        name='whisper-worker', daemon=True)
+        self._thread.start()
 
         info("Started transcription worker")
 
@@ -349,8 +597,9 @@ class TranscriptionWorker:
         # Add sentinel value to wake up worker
         self.audio_queue.put(None)
 
-        if self.worker_thread:
-            self.worker_thread.join(timeout=1.0)
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
 
         info("Stopped transcription worker")
 
@@ -375,15 +624,38 @@ class TranscriptionWorker:
 
     def _worker_loop(self):
         """Main worker loop that processes audio queue."""
-        while self.is_running:
+        while True:
             try:
-                # Get audio from queue with timeout
-                audio = self.audio_queue.get(timeout=0.1)
+                # Block until audio arrives; the None sentinel from stop()
+                # is the only wake-up needed, so no timeout polling
+                audio = self.audio_queue.get()
 
                 # Check for sentinel value
                 if audio is None:
                     break
 
+                # Drain whatever else is already queued and merge it into
+                # a single transcribe call - amortizes model invocation
+                # overhead when chunks arrive in bursts
+                extras = []
+                total_samples = len(audio)
+                stop_after_batch = False
+                while total_samples < self.max_batch_samples:
+                    try:
+                        next_audio = self.audio_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if next_audio is None:
+                        stop_after_batch = True
+                        break
+                    extras.append(next_audio)
+                    total_samples += len(next_audio)
+
+                if extras:
+                    audio = np.concatenate([audio, *extras])
+                    debug("Batched %d audio chunks (%d samples) into one "
+                          "transcription", len(extras) + 1, total_samples)
+
                 # Transcribe audio
                 result = self.transcriber.transcribe(audio, self.current_language)
 
@@ -392,8 +664,9 @@ class TranscriptionWorker:
                 else:
                     self.on_error("Transcription failed")
 
-            except queue.Empty:
-                continue
+                if stop_after_batch:
+                    break
+
             except Exception as e:
                 error(f"Worker loop error: {e}")
                 self.on_error(f"Worker error: {e}")
\ No newline at end of file
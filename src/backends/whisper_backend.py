@@ -5,15 +5,21 @@ Provides GPU-accelerated speech transcription using faster-whisper
 with real-time audio capture and keyboard output.
 """
 
+import os
+import queue
+import re
+import threading
 import time
 from typing import Optional, List, Dict, Any
+
+import numpy as np
 from .base_backend import BaseBackend, BackendStatus
 from src.core.logging_controller import info, debug, warning, error, critical
 
 # Try to import Whisper components
 try:
     from .whisper.audio_capture import AudioCapture
-    from .whisper.transcriber import WhisperTranscriber, TranscriptionWorker
+    from .whisper.transcriber import WhisperTranscriber, TranscriptionWorker, TranscriptionResult
     from .whisper.keyboard_output import KeyboardOutput, TextProcessor
     from .whisper.keyword_detector import KeywordDetector
     from .whisper.command_registry import CommandRegistry
@@ -25,6 +31,9 @@ except ImportError as e:
     warning(f"Whisper backend not available: {e}")
     info("Install with: ./install_whisper_backend.sh")
 
+# Pulls the allocation size out of CUDA out-of-memory messages
+_CUDA_OOM_RE = re.compile(r'Tried to allocate (\d+\.?\d*) ([GM]iB)')
+
 
 class WhisperBackend(BaseBackend):
     """
@@ -34,10 +43,43 @@ class WhisperBackend(BaseBackend):
     and keyboard output for seamless dictation.
     """
 
+    __slots__ = (
+        'model_size', 'device', 'compute_type', 'device_index',
+        'sample_rate', 'channels', 'chunk_size', 'silence_duration',
+        'energy_threshold', 'min_audio_length', 'vad_aggressiveness',
+        'use_vad', 'cpu_threads', 'num_workers', 'database',
+        'session_start_time', 'total_text_typed', 'last_transcription_time',
+        'is_first_chunk', '_last_typed_normalized', 'suppressed_repetitions',
+        'min_confidence',
+        'transcriber', 'text_processor', 'keyboard_output', 'audio_capture',
+        'transcription_worker', 'keyword_detector', 'command_registry',
+        'command_executor', 'voice_commands_enabled',
+        '_vc_settings', '_result_queue', '_result_thread',
+        'idle_unload_seconds', '_idle_unload_timer', '_preload_thread',
+    )
+
+    # xdotool's default inter-keystroke delay, used to bound the wait
+    # for the keyboard flush before a voice command executes
+    _XDOTOOL_SECS_PER_CHAR = 0.012
+    _CMD_FLUSH_BUFFER = 0.2    # extra margin when a command follows
+    _NOCMD_FLUSH_BUFFER = 0.1  # shorter margin when nothing follows
+
+    # Precision ladder tried on CUDA out-of-memory during model load;
+    # each step roughly halves the weight memory
+    _QUANT_LADDER = ('float16', 'int8_float16', 'int8')
+
+    # Whisper's stock low-confidence hallucinations on silence/noise;
+    # only suppressed when the result confidence is also weak
+    _HALLUCINATIONS = {'thank you.', 'thank you', 'you', 'bye.', 'bye', '.'}
+
+    # Repetition loops emit the duplicate chunk immediately; a repeat
+    # arriving after this window is the user dictating the phrase again
+    _REPEAT_WINDOW_SECS = 2.0
+
     def __init__(self,
                  model_size: str = "medium",
                  device: str = "cuda",
-                 compute_type: str = "float16",
+                 compute_type: str = "auto",
                  sample_rate: int = 16000,
                  device_index: Optional[int] = None,
                  silence_duration: float = 1.0,
@@ -46,6 +88,9 @@ class WhisperBackend(BaseBackend):
                  chunk_size: int = 480,
                  channels: int = 1,
                  vad_aggressiveness: int = 2,
+                 use_vad: bool = True,
+                 cpu_threads: Optional[int] = None,
+                 num_workers: int = 1,
                  database=None):
         """
         Initialize Whisper backend.
@@ -53,7 +98,8 @@ class WhisperBackend(BaseBackend):
         Args:
             model_size: Whisper model size (tiny, base, small, medium, large)
             device: Device to use (cuda or cpu)
-            compute_type: Compute precision (float16 for GPU, float32 for CPU)
+            compute_type: Compute precision ('auto' lets CTranslate2 pick
+                the fastest supported kernel for the device)
             sample_rate: Audio sample rate
             device_index: Audio device index (None for auto-detect)
             silence_duration: Seconds of silence before processing speech
@@ -62,10 +108,22 @@ class WhisperBackend(BaseBackend):
             chunk_size: Audio chunk size for VAD (must be 160, 320, 480, or 960)
             channels: Number of audio channels (1 for mono, 2 for stereo)
             vad_aggressiveness: WebRTC VAD aggressiveness level (0-3)
+            use_vad: Gate silent chunks before they reach the
+                transcription queue (and keep Silero VAD on in the model)
+            cpu_threads: CTranslate2 intra-op threads for CPU inference
+                (None = physical-core heuristic on CPU, library default
+                on GPU; CPU decoding scales well up to physical cores)
+            num_workers: CTranslate2 worker count for concurrent calls
             database: Database instance for voice command settings (optional)
         """
         super().__init__("Whisper")
 
+        # A model spec may carry a quantization suffix ("medium@int8");
+        # the suffix overrides compute_type for that model
+        model_size, quant = self._parse_model_spec(model_size)
+        if quant:
+            compute_type = quant
+
         # Set default attributes first
         self.model_size = model_size
         self.device = device
@@ -83,12 +141,35 @@ class WhisperBackend(BaseBackend):
         self.energy_threshold = energy_threshold
         self.min_audio_length = min_audio_length
         self.vad_aggressiveness = vad_aggressiveness
+        self.use_vad = use_vad
+
+        # CPU inference scales with thread count up to physical cores;
+        # cpu_count() reports logical cores, so halve it as a heuristic
+        if cpu_threads is None:
+            cpu_threads = (os.cpu_count() or 2) // 2 if device == "cpu" else 0
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers
+
+        # Keep the model resident this long after stop() before freeing
+        # VRAM, so back-to-back sessions skip the 1-2s reload.
+        # 0 unloads immediately, None keeps the model loaded until
+        # cleanup() or a model change; cleanup() always unloads.
+        self.idle_unload_seconds: Optional[float] = 300.0
+        self._idle_unload_timer: Optional[threading.Timer] = None
+
+        # Background model preload (see preload_model_async)
+        self._preload_thread: Optional[threading.Thread] = None
 
         # Session tracking (initialize even if dependencies missing)
         self.session_start_time: Optional[float] = None
         self.total_text_typed = 0
         self.last_transcription_time: Optional[float] = None
         self.is_first_chunk = True  # Track if this is the first chunk of the session
+        self._last_typed_normalized = ''  # De-dup against Whisper repetition loops
+        self.suppressed_repetitions = 0
+
+        # Results below this average confidence are dropped outright
+        self.min_confidence = 0.35
 
         # Component placeholders
         self.transcriber = None
@@ -97,11 +178,22 @@ class WhisperBackend(BaseBackend):
         self.audio_capture: Optional[AudioCapture] = None
         self.transcription_worker: Optional[TranscriptionWorker] = None
 
+        # Dedicated result-processing thread: keyword detection, text
+        # processing and command execution run here so the transcription
+        # worker's callback returns immediately and can pull the next
+        # audio chunk while xdotool is still typing
+        self._result_queue: Optional[queue.SimpleQueue] = None
+        self._result_thread: Optional[threading.Thread] = None
+
         # Voice command components
         self.keyword_detector: Optional[KeywordDetector] = None
         self.command_registry = None
         self.command_executor = None
         self.voice_commands_enabled = False
+        # Compiled keyword pattern, rebuilt only when the keyword changes
+        # Snapshot of the applied settings; lets no-op updates (e.g.
+        # reopening the settings panel) skip the DB write and detector work
+        self._vc_settings: Optional[tuple] = None
 
         if not WHISPER_AVAILABLE:
             self._set_status(BackendStatus.ERROR,
@@ -110,11 +202,22 @@ class WhisperBackend(BaseBackend):
 
         # Initialize components
         try:
+            resolved_compute_type = self._resolve_compute_type()
+            info(f"Using compute_type '{resolved_compute_type}' on {device}"
+                 + (f", cpu_threads={self.cpu_threads}" if device == "cpu" else ""))
+
             self.transcriber = WhisperTranscriber(
                 model_size=model_size,
                 device=device,
-                compute_type=compute_type
+                compute_type=resolved_compute_type,
+                cpu_threads=self.cpu_threads,
+                num_workers=self.num_workers
             )
+            # Keep the model's Silero VAD in step with the capture-side
+            # silence window so both stages agree on what counts as a pause
+            self.transcriber.vad_filter = use_vad
+            self.transcriber.vad_parameters['min_silence_duration_ms'] = \
+                int(self.silence_duration * 1000)
 
             self.text_processor = TextProcessor()
             self.keyboard_output = KeyboardOutput(on_error=self._on_error)
@@ -132,6 +235,71 @@ class WhisperBackend(BaseBackend):
         except Exception as e:
             self._set_status(BackendStatus.ERROR, f"Failed to initialize Whisper: {e}")
 
+    @staticmethod
+    def _parse_model_spec(spec: str) -> tuple:
+        """
+        Split a model spec into (size, quantization).
+
+        "medium@int8" -> ("medium", "int8"); a bare size like "medium"
+        returns ("medium", None).
+        """
+        if '@' in spec:
+            size, quant = spec.split('@', 1)
+            return size, quant
+        return spec, None
+
+    def _resolve_compute_type(self) -> str:
+        """
+        Resolve the configured compute_type for the current device.
+
+        FP16 variants are not efficient (or not supported) on CPUs and
+        on GPUs older than compute capability 7.0, where CTranslate2
+        would error out or silently fall back; downgrade those cases to
+        int8, which uses CTranslate2's dynamic-INT8 GEMM kernels
+        (VNNI/dot-product instructions where the CPU has them). On
+        Ampere and newer (compute capability 8.0+) prefer the bfloat16
+        variants, which match FP16 throughput with a wider range.
+        """
+        if self.device == "cpu":
+            if self.compute_type in ("float16", "int8_float16", "bfloat16",
+                                     "int8_bfloat16"):
+                info(f"'{self.compute_type}' requested on CPU, downgrading to int8")
+                return "int8"
+            return self.compute_type
+
+        if self.device == "cuda":
+            try:
+                import torch
+                major, _minor = torch.cuda.get_device_capability()
+            except Exception:
+                # torch unavailable or no GPU visible, keep as requested
+                return self.compute_type
+
+            if self.compute_type == "auto":
+                # Pick the best native precision for the architecture
+                if major >= 8:
+                    return "bfloat16"
+                if major >= 7:
+                    return "float16"
+                return "int8"
+
+            if major >= 8:
+                # Ampere and newer run BF16 at FP16 throughput with a
+                # wider exponent range (no overflow in encoder softmax)
+                if self.compute_type == "float16":
+                    info("Ampere+ GPU detected, preferring bfloat16 over float16")
+                    return "bfloat16"
+                if self.compute_type == "int8_float16":
+                    info("Ampere+ GPU detected, preferring int8_bfloat16 over int8_float16")
+                    return "int8_bfloat16"
+            elif major < 7 and self.compute_type in ("float16", "int8_float16",
+                                                     "bfloat16", "int8_bfloat16"):
+                info(f"GPU compute capability {major}.x lacks fast FP16/BF16, "
+                     f"downgrading to int8")
+                return "int8"
+
+        return self.compute_type
+
     def _check_dependencies(self):
         """Check if required dependencies are available."""
         deps = self.keyboard_output.check_dependencies()
@@ -164,11 +332,21 @@ class WhisperBackend(BaseBackend):
         try:
             self._set_status(BackendStatus.STARTING)
 
+            # A new session arrived before the idle window expired:
+            # keep the model resident
+            self._cancel_idle_unload()
+
+            # If a background preload is still running, wait for it
+            # instead of racing it on load_lock
+            if self._preload_thread is not None:
+                self._preload_thread.join()
+                self._preload_thread = None
+
             # Check if model is loaded
             if not self.transcriber.is_model_loaded:
                 # Try to load model with better error handling
                 try:
-                    if not self.transcriber.load_model():
+                    if not self._load_model_with_fallback():
                         self._set_status(BackendStatus.ERROR, "Failed to load Whisper model")
                         return False
                 except Exception as e:
@@ -176,8 +354,7 @@ class WhisperBackend(BaseBackend):
                     # Check for CUDA out of memory specifically
                     if "CUDA out of memory" in error_msg or "out of memory" in error_msg.lower():
                         # Extract memory requirements from error if available
-                        import re
-                        match = re.search(r'Tried to allocate (\d+\.?\d*) ([GM]iB)', error_msg)
+                        match = _CUDA_OOM_RE.search(error_msg)
                         if match:
                             size, unit = match.groups()
                             memory_needed = f"{size} {unit}"
@@ -190,8 +367,9 @@ class WhisperBackend(BaseBackend):
                             f"Solutions:\n"
                             f"1. Close other GPU applications (Ollama, games, etc.)\n"
                             f"2. Use a smaller model (Settings → Whisper → Model Size)\n"
-                            f"3. Switch to CPU mode (Settings → Whisper → Device → cpu)\n"
-                            f"4. Use Vosk backend instead (Settings → Backend → Vosk)"
+                            f"3. Use a lower precision (compute_type int8 roughly halves VRAM)\n"
+                            f"4. Switch to CPU mode (Settings → Whisper → Device → cpu)\n"
+                            f"5. Use Vosk backend instead (Settings → Backend → Vosk)"
                         )
                         self._set_status(BackendStatus.ERROR, detailed_error)
                     else:
@@ -212,6 +390,13 @@ class WhisperBackend(BaseBackend):
             # Reset correction state for new session
             self.keyboard_output.reset_correction_state()
 
+            # Start the result-processing thread before the worker that
+            # feeds it
+            self._result_queue = queue.SimpleQueue()
+            self._result_thread = threading.Thread(target=self._result_loop)
+            self._result_thread.daemon = True
+            self._result_thread.start()
+
             # Start transcription worker
             self.transcription_worker = TranscriptionWorker(
                 transcriber=self.transcriber,
@@ -239,11 +424,14 @@ class WhisperBackend(BaseBackend):
             )
             self.audio_capture.start()
 
-            # Initialize session
-            self.session_start_time = time.time()
+            # Initialize session (monotonic clock: durations stay correct
+            # across NTP/wall-clock adjustments)
+            self.session_start_time = time.perf_counter()
             self.total_text_typed = 0
             self.last_transcription_time = None
             self.is_first_chunk = True  # Reset for new session
+            self._last_typed_normalized = ''
+            self.suppressed_repetitions = 0
 
             self._set_status(BackendStatus.RUNNING)
             info(f"Whisper dictation started with language '{language}'")
@@ -256,6 +444,77 @@ class WhisperBackend(BaseBackend):
             self._set_status(BackendStatus.ERROR, error_msg)
             return False
 
+    def preload_model_async(self):
+        """
+        Start loading the model on a background thread.
+
+        Called at app startup so the weights are usually resident by the
+        time the user presses the dictation hotkey; start() joins the
+        thread and falls back to its own (fallback-aware) load path if
+        the preload failed.
+        """
+        if self.transcriber is None or self.transcriber.is_model_loaded:
+            return
+        if self._preload_thread is not None and self._preload_thread.is_alive():
+            return
+
+        def _preload():
+            try:
+                self.transcriber.load_model()
+            except Exception as e:
+                # start() retries with the precision fallback ladder and
+                # surfaces a proper error state; here a warning suffices
+                warning(f"Background model preload failed: {e}")
+
+        self._preload_thread = threading.Thread(target=_preload, daemon=True)
+        self._preload_thread.start()
+        info("Whisper model preload started in background")
+
+    def _load_model_with_fallback(self) -> bool:
+        """
+        Load the model, degrading precision instead of failing on CUDA OOM.
+
+        On an out-of-memory error the remaining steps of _QUANT_LADDER
+        are tried in order. A successful downgrade is persisted to the
+        database so the next session starts at the working precision
+        without repeating the failed attempts.
+
+        Returns:
+            True if the model loaded (possibly at reduced precision)
+
+        Raises:
+            Exception: the last load error when every step fails, or
+                immediately for non-OOM errors
+        """
+        try:
+            return self.transcriber.load_model()
+        except Exception as e:
+            if self.device != "cuda" or "out of memory" not in str(e).lower():
+                raise
+            last_error = e
+
+        current = self.transcriber.compute_type
+        start_idx = (self._QUANT_LADDER.index(current) + 1
+                     if current in self._QUANT_LADDER else 0)
+        for fallback in self._QUANT_LADDER[start_idx:]:
+            warning(f"CUDA out of memory with compute_type '{current}', "
+                    f"retrying with '{fallback}'")
+            self.transcriber.compute_type = fallback
+            try:
+                if self.transcriber.load_model():
+                    self.compute_type = fallback
+                    if self.database:
+                        self.database.save_setting('whisper_compute_type', fallback)
+                    info(f"Model loaded after precision fallback to '{fallback}'")
+                    return True
+            except Exception as e:
+                if "out of memory" not in str(e).lower():
+                    raise
+                last_error = e
+            current = fallback
+
+        raise last_error
+
     def stop(self) -> bool:
         """
         Stop Whisper dictation and optionally unload model.
@@ -280,13 +539,20 @@ class WhisperBackend(BaseBackend):
                 self.transcription_worker.stop()
                 self.transcription_worker = None
 
+            # Stop the result-processing thread (sentinel wakes it)
+            if self._result_thread:
+                self._result_queue.put(None)
+                self._result_thread.join(timeout=1.0)
+                self._result_thread = None
+                self._result_queue = None
+
             # Stop keyboard output
             self.keyboard_output.stop()
 
             # Calculate session duration
             session_duration = None
             if self.session_start_time:
-                session_duration = time.time() - self.session_start_time
+                session_duration = time.perf_counter() - self.session_start_time
                 info(f"Session ended. Duration: {session_duration:.1f}s, "
                           f"Text typed: {self.total_text_typed} chars")
 
@@ -300,10 +566,11 @@ class WhisperBackend(BaseBackend):
                 'performance_stats': self.transcriber.get_performance_stats()
             }
 
-            # IMPORTANT: Unload model to free VRAM
-            if self.transcriber:
-                self.transcriber.unload_model()
-                info("Whisper model unloaded from VRAM")
+            # Defer the VRAM release: unloading here made every
+            # push-to-talk restart pay the model reload. Arm an idle
+            # timer instead and free the memory only if no session
+            # starts within the window.
+            self._schedule_idle_unload()
 
             self._set_status(BackendStatus.STOPPED)
             info("Whisper dictation stopped")
@@ -316,6 +583,55 @@ class WhisperBackend(BaseBackend):
             self._set_status(BackendStatus.ERROR, error_msg)
             return False
 
+    def _schedule_idle_unload(self):
+        """Arm (or re-arm) the deferred model unload after stop()."""
+        self._cancel_idle_unload()
+
+        if self.idle_unload_seconds is None:
+            # Keep the model resident until cleanup()/update_model_size
+            debug("Model stays loaded (keep-loaded mode)")
+            return
+
+        if self.idle_unload_seconds <= 0:
+            # Immediate unload requested
+            self._idle_unload()
+            return
+
+        self._idle_unload_timer = threading.Timer(
+            self.idle_unload_seconds, self._idle_unload)
+        self._idle_unload_timer.daemon = True
+        self._idle_unload_timer.start()
+        debug("Model unload deferred %.0fs", self.idle_unload_seconds)
+
+    def _cancel_idle_unload(self):
+        """Cancel a pending deferred unload, if any."""
+        if self._idle_unload_timer is not None:
+            self._idle_unload_timer.cancel()
+            self._idle_unload_timer = None
+
+    def _idle_unload(self):
+        """Free the model after the idle window expired without a restart."""
+        self._idle_unload_timer = None
+        if self.transcriber and self.transcriber.is_model_loaded and not self.is_running:
+            self.transcriber.unload_model()
+            info("Whisper model unloaded from VRAM after idle timeout")
+
+    def set_idle_unload_seconds(self, seconds: Optional[float]):
+        """
+        Configure how long the model stays resident after stop().
+
+        Args:
+            seconds: Idle window before VRAM is freed (0 = unload
+                immediately on stop, None = keep loaded until
+                cleanup() or a model change)
+        """
+        if seconds is None:
+            self.idle_unload_seconds = None
+            info("Model will stay loaded between sessions")
+            return
+        self.idle_unload_seconds = max(0.0, seconds)
+        info(f"Idle unload window set to {self.idle_unload_seconds:.0f}s")
+
     def get_available_models(self, language: Optional[str] = None) -> List[str]:
         """
         Get available Whisper models.
@@ -324,9 +640,14 @@ class WhisperBackend(BaseBackend):
             language: Optional language filter (not used for Whisper)
 
         Returns:
-            List of available model sizes
+            List of available model sizes, including quantized variants
+            ("size@quant"). INT8 variants cut VRAM roughly in half and
+            speed up CPU inference, letting large models fit small GPUs.
         """
-        return ['tiny', 'base', 'small', 'medium', 'large']
+        sizes = ['tiny', 'base', 'small', 'medium', 'large']
+        return (sizes
+                + [f'{size}@int8' for size in sizes]
+                + [f'{size}@int8_float16' for size in sizes])
 
     def supports_language(self, language: str) -> bool:
         """
@@ -353,7 +674,8 @@ class WhisperBackend(BaseBackend):
             'backend': self.name,
             'status': self.status.value,
             'total_text_typed': self.total_text_typed,
-            'session_duration': time.time() - self.session_start_time if self.session_start_time else None,
+            'suppressed_repetitions': self.suppressed_repetitions,
+            'session_duration': time.perf_counter() - self.session_start_time if self.session_start_time else None,
             'last_transcription_time': self.last_transcription_time
         }
 
@@ -371,38 +693,88 @@ class WhisperBackend(BaseBackend):
             audio_chunk: Numpy array of audio samples
         """
         if self.transcription_worker:
+            # Silence gate before the queue: a vectorized peak check
+            # costs microseconds and spares the worker a wakeup (and
+            # the model an encoder pass) for chunks that cannot contain
+            # speech - common with low energy_threshold settings
+            if (self.use_vad and
+                    float(np.max(np.abs(audio_chunk))) < self.transcriber.silence_threshold):
+                debug("Dropping silent chunk before transcription queue")
+                return
             self.transcription_worker.add_audio(audio_chunk)
 
-    def _on_transcription_result(self, result: Dict[str, Any]):
+    def _on_transcription_result(self, result: 'TranscriptionResult'):
+        """
+        Receive a transcription result from the worker thread.
+
+        Only enqueues: the heavy lifting (keyword detection, text
+        processing, typing waits, command execution) happens on the
+        result thread so the worker can dequeue the next chunk at once.
+
+        Args:
+            result: TranscriptionResult from the transcriber
+        """
+        if self._result_queue is not None:
+            self._result_queue.put(result)
+        else:
+            # No session thread (e.g. direct use in tests): process inline
+            self._process_transcription_result(result)
+
+    def _result_loop(self):
+        """Consume transcription results until the None sentinel."""
+        result_queue = self._result_queue  # survives stop() clearing the attr
+        while True:
+            result = result_queue.get()
+            if result is None:
+                break
+            self._process_transcription_result(result)
+
+    def _process_transcription_result(self, result: 'TranscriptionResult'):
         """
         Handle successful transcription with voice command detection.
 
         Args:
-            result: Transcription result dictionary
+            result: TranscriptionResult from the transcriber
         """
         try:
-            text = result['text']
-            if not text.strip():
+            text = self._normalize(result.text)
+            if text is None:
                 return
 
+            # Confidence gate: skip text processing and xdotool entirely
+            # for results Whisper itself does not believe in
+            confidence = result.avg_confidence
+            if confidence is not None:
+                if confidence < self.min_confidence:
+                    debug("Dropping low-confidence result (%.2f): '%s'",
+                          confidence, text)
+                    return
+                if confidence < 0.6 and text.lower() in self._HALLUCINATIONS:
+                    debug("Dropping likely hallucination (%.2f): '%s'",
+                          confidence, text)
+                    return
+
             # Check for voice commands if enabled
             if self.voice_commands_enabled and self.keyword_detector:
-                # IMPORTANT: Normalize text to lowercase before keyword detection
-                # This prevents the keyword from being written with capital letter
-                text_normalized = text.lower()
-                detection_result = self.keyword_detector.process_text(text_normalized)
+                # The detector lowercases internally and the keyword regex
+                # is IGNORECASE, so pass the raw text: lowering here would
+                # allocate a second full-length copy of every chunk
+                detection_result = self.keyword_detector.process_text(text)
 
                 if detection_result.detected_keyword:
-                    # Extract text BEFORE the keyword (if any)
-                    # This ensures we don't lose text like "hola que tal tony enter"
-                    text_before_keyword = self._extract_text_before_keyword(text, self.keyword_detector.keyword)
+                    # Text BEFORE the keyword (if any) comes out of the
+                    # detector's own keyword match - no second scan, and
+                    # no chance of the raw/lowered positions diverging
+                    text_before_keyword = detection_result.text_before
 
                     if detection_result.command_candidate:
                         # We have both keyword and command - execute it
 
                         # First, type any text that came BEFORE the keyword
+                        # (already stripped by _extract_text_before_keyword)
                         text_length = 0
-                        if text_before_keyword.strip():
+                        typed_event = None
+                        if text_before_keyword:
                             processed_before = self.text_processor.process_text(text_before_keyword)
 
                             # Add space before chunk (except for first chunk)
@@ -411,18 +783,22 @@ class WhisperBackend(BaseBackend):
                             else:
                                 self.is_first_chunk = False
 
-                            self.keyboard_output.type_text(processed_before, enable_correction=False)
+                            typed_event = threading.Event()
+                            self.keyboard_output.type_text(processed_before,
+                                                           enable_correction=False,
+                                                           completion_event=typed_event)
                             self.total_text_typed += len(processed_before)
                             text_length = len(processed_before)
-                            debug(f"Typed text before keyword: '{processed_before}'")
+                            debug("Typed text before keyword: '%s'", processed_before)
 
-                        # IMPORTANT: Wait for text to finish typing before executing command
-                        # xdotool type has a default delay of ~12ms per character
-                        # Add buffer to ensure text completes before command executes
-                        if text_length > 0:
-                            typing_time = (text_length * 0.012) + 0.1  # 12ms per char + 100ms buffer
-                            debug(f"Waiting {typing_time:.2f}s for text to complete before command")
-                            time.sleep(typing_time)
+                        # IMPORTANT: the text must finish typing before the command
+                        # executes. Wait for the output worker to flush it instead
+                        # of sleeping a pessimistic upper bound (~12ms per char);
+                        # the old worst case remains as the timeout.
+                        if typed_event is not None:
+                            typed_event.wait(
+                                timeout=text_length * self._XDOTOOL_SECS_PER_CHAR
+                                + self._CMD_FLUSH_BUFFER)
 
                         # Now execute the command
                         command = self.command_registry.find_matching_command(
@@ -439,26 +815,24 @@ class WhisperBackend(BaseBackend):
                             warning(f"Unknown voice command: '{detection_result.command_candidate}'")
 
                         # Type remaining text if present (text after the command)
-                        if detection_result.remaining_text:
-                            remaining_text = detection_result.remaining_text.strip()
-                            if remaining_text:
-                                processed_remaining = self.text_processor.process_text(remaining_text)
-                                # Add space before remaining text
-                                processed_remaining = ' ' + processed_remaining
-                                self.keyboard_output.type_text(processed_remaining, enable_correction=False)
-                                self.total_text_typed += len(processed_remaining)
-                                info(f"Typed remaining text after command: '{processed_remaining}'")
+                        remaining_text = self._normalize(detection_result.remaining_text)
+                        if remaining_text is not None:
+                            processed_remaining = self.text_processor.process_text(remaining_text)
+                            # Add space before remaining text
+                            processed_remaining = ' ' + processed_remaining
+                            self.keyboard_output.type_text(processed_remaining, enable_correction=False)
+                            self.total_text_typed += len(processed_remaining)
+                            info(f"Typed remaining text after command: '{processed_remaining}'")
 
                         # Update timestamp
-                        self.last_transcription_time = time.time()
+                        self.last_transcription_time = time.perf_counter()
 
                         # Don't process the keyword/command as text - already handled
                         return
                     else:
                         # Keyword detected but no command yet - wait for next chunk
                         # BUT FIRST: type any text that came BEFORE the keyword
-                        text_length = 0
-                        if text_before_keyword.strip():
+                        if text_before_keyword:
                             processed_before = self.text_processor.process_text(text_before_keyword)
 
                             # Add space before chunk (except for first chunk)
@@ -467,23 +841,38 @@ class WhisperBackend(BaseBackend):
                             else:
                                 self.is_first_chunk = False
 
-                            self.keyboard_output.type_text(processed_before, enable_correction=False)
+                            typed_event = threading.Event()
+                            self.keyboard_output.type_text(processed_before,
+                                                           enable_correction=False,
+                                                           completion_event=typed_event)
                             self.total_text_typed += len(processed_before)
-                            text_length = len(processed_before)
-                            debug(f"Typed text before keyword: '{processed_before}'")
+                            debug("Typed text before keyword: '%s'", processed_before)
 
-                            # Wait for text to finish typing
-                            if text_length > 0:
-                                typing_time = (text_length * 0.012) + 0.05  # Shorter buffer since no command follows
-                                debug(f"Waiting {typing_time:.2f}s for text to complete")
-                                time.sleep(typing_time)
+                            # Wait for the output worker to flush the text
+                            typed_event.wait(
+                                timeout=len(processed_before) * self._XDOTOOL_SECS_PER_CHAR
+                                + self._NOCMD_FLUSH_BUFFER)
 
-                        debug(f"Keyword '{self.keyword_detector.keyword}' detected, waiting for command...")
+                        debug("Keyword '%s' detected, waiting for command...", self.keyword_detector.keyword)
                         return
 
             # Process the text normally (no command detected)
             processed_text = self.text_processor.process_text(text)
 
+            # Whisper repetition loops emit the same chunk back to back;
+            # typing it again is pure xdotool cost, so drop exact repeats
+            # - but only when they arrive within the loop window, so a
+            # user legitimately dictating the same phrase again later
+            # still gets it typed
+            if (processed_text == self._last_typed_normalized
+                    and self.last_transcription_time is not None
+                    and (time.perf_counter() - self.last_transcription_time
+                         < self._REPEAT_WINDOW_SECS)):
+                self.suppressed_repetitions += 1
+                debug("Suppressed repeated chunk: '%s'", processed_text)
+                return
+            self._last_typed_normalized = processed_text
+
             # Add space before chunk (except for first chunk)
             # This prevents chunks from being concatenated without spaces
             if not self.is_first_chunk:
@@ -499,16 +888,27 @@ class WhisperBackend(BaseBackend):
 
             # Update statistics
             self.total_text_typed += len(processed_text)
-            self.last_transcription_time = time.time()
+            self.last_transcription_time = time.perf_counter()
 
-            debug(f"Typed: '{processed_text}' "
-                        f"(confidence: {result.get('avg_confidence', 0):.2f}, "
-                        f"RTF: {result.get('real_time_factor', 0):.2f})")
+            debug("Typed: '%s' (confidence: %.2f, RTF: %.2f)",
+                  processed_text, result.avg_confidence or 0, result.real_time_factor)
 
         except Exception as e:
             error(f"Failed to handle transcription result: {e}")
             self._on_error(f"Result handling error: {e}")
 
+    @staticmethod
+    def _normalize(text: Optional[str]) -> Optional[str]:
+        """
+        Strip a transcription string once.
+
+        Returns None for empty or whitespace-only input (isspace avoids
+        allocating a stripped copy just to find out it is blank).
+        """
+        if not text or text.isspace():
+            return None
+        return text.strip()
+
     def _on_error(self, error_message: str):
         """
         Handle errors from components.
@@ -536,22 +936,28 @@ class WhisperBackend(BaseBackend):
         Update the Whisper model size. Unloads current model and prepares for new one.
 
         Args:
-            new_model_size: New model size (tiny, base, small, medium, large)
+            new_model_size: New model size (tiny, base, small, medium,
+                large), optionally with a quantization suffix ("medium@int8")
 
         Returns:
             True if update successful
         """
         info(f"Updating Whisper model from '{self.model_size}' to '{new_model_size}'")
 
+        new_model_size, quant = self._parse_model_spec(new_model_size)
+
         # Stop if running
         if self.is_running:
             info("Stopping current session before model update")
             self.stop()
 
-        # Unload current model if loaded
+        # Detach the current model (and drop any deferred unload); it
+        # stays in the transcriber's small cache so switching back to it
+        # is instant instead of a full reload
+        self._cancel_idle_unload()
         if self.transcriber and self.transcriber.is_model_loaded:
-            self.transcriber.unload_model()
-            info("Previous model unloaded from VRAM")
+            self.transcriber.release_model()
+            info("Previous model released (kept cached for fast switch-back)")
 
         # Update model size
         old_model = self.model_size
@@ -560,6 +966,10 @@ class WhisperBackend(BaseBackend):
         # Update transcriber with new model size
         if self.transcriber:
             self.transcriber.model_size = new_model_size
+            if quant:
+                self.compute_type = quant
+                self.transcriber.compute_type = quant
+                info(f"Compute type updated to '{quant}'")
             self.transcriber.is_model_loaded = False
             info(f"Model size updated from '{old_model}' to '{new_model_size}'")
             return True
@@ -597,36 +1007,14 @@ class WhisperBackend(BaseBackend):
         if self.is_running:
             self.stop()
 
+        # Shutdown is unconditional: drop any pending idle timer and free now
+        self._cancel_idle_unload()
         if self.transcriber is not None:
             self.transcriber.unload_model()
         info("Whisper backend cleaned up")
 
     # Voice command methods
 
-    def _extract_text_before_keyword(self, text: str, keyword: str) -> str:
-        """
-        Extract text that appears before the keyword.
-
-        Args:
-            text: Full text (may contain keyword)
-            keyword: Activation keyword to search for
-
-        Returns:
-            Text before keyword, or empty string if keyword is at start
-        """
-        import re
-
-        # Search for keyword with word boundaries (case-insensitive)
-        keyword_pattern = r'\b' + re.escape(keyword.lower()) + r'\b'
-        match = re.search(keyword_pattern, text.lower())
-
-        if match:
-            # Return everything before the keyword
-            return text[:match.start()].strip()
-
-        # Keyword not found (shouldn't happen, but return empty)
-        return ""
-
     def _load_voice_command_settings(self):
         """Load voice command settings from database"""
         if not self.database:
@@ -644,6 +1032,8 @@ class WhisperBackend(BaseBackend):
             max_command_words = settings.get('max_command_words', 1)
 
             self.voice_commands_enabled = enabled
+            self._vc_settings = (keyword, timeout, sensitivity, enabled,
+                                 max_command_words)
 
             # Initialize keyword detector if enabled
             if enabled:
@@ -678,6 +1068,13 @@ class WhisperBackend(BaseBackend):
             max_command_words: Maximum words for multi-word commands (1-5)
         """
         try:
+            # Unchanged settings: skip the DB write and detector rebuild
+            new_settings = (keyword, timeout, sensitivity, enabled,
+                            max_command_words)
+            if new_settings == self._vc_settings:
+                debug("Voice command settings unchanged, skipping update")
+                return
+
             # Save to database if available
             if self.database:
                 self.database.save_voice_command_settings(
@@ -709,6 +1106,7 @@ class WhisperBackend(BaseBackend):
             else:
                 self.keyword_detector = None
 
+            self._vc_settings = new_settings
             info(f"Voice command settings updated: keyword='{keyword}', enabled={enabled}, max_command_words={max_command_words}")
 
         except Exception as e:
@@ -3,7 +3,58 @@ Configuration management for Dictation Manager
 """
 
 from pathlib import Path
+import functools
 import os
+import re
+
+
+# Language token in a model name, delimited by -/_ or the string ends,
+# so "es" only matches as a component ("vosk-model-es-0.42") and not as
+# a substring of an unrelated word
+_LANG_RE = re.compile(r'(?i)(?:^|[-_])(es|spanish|en|english)(?:[-_]|$)')
+_LANG_MAP = {
+    'es': 'spanish',
+    'spanish': 'spanish',
+    'en': 'english',
+    'english': 'english',
+}
+
+# KEY=VALUE lines in .env; comment and blank lines never match because a
+# key must start with an identifier character. Bytes-level so the file
+# is scanned once without decoding it wholesale.
+_ENV_RE = re.compile(
+    rb'(?m)^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*(.*?)[ \t\r]*$'
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_env_file():
+    """
+    Parse the project .env file once per process.
+
+    Config is instantiated from several modules; caching the parsed
+    dict at module level avoids re-reading the file each time. Callers
+    must not mutate the returned dict.
+    """
+    env_file = Path(__file__).parent.parent.parent / ".env"
+
+    if not env_file.exists():
+        return {}
+
+    try:
+        # One read of the whole file, parsed in a single regex scan.
+        # Decoding stays inside the try so malformed bytes degrade to a
+        # warning (errors='replace' keeps the unaffected entries) rather
+        # than aborting startup.
+        data = env_file.read_bytes()
+        return {
+            m.group(1).decode(): m.group(2).decode(errors='replace')
+            for m in _ENV_RE.finditer(data)
+        }
+    except Exception as e:
+        from src.core.logging_controller import warning
+        warning(f"Could not load .env file: {e}")
+        return {}
 
 
 class Config:
@@ -26,6 +77,8 @@ class Config:
             self.nerd_dictation_dir = self.app_dir / "apps" / "nerd-dictation"
 
         self.models_dir = Path(env_vars.get("MODELS_DIR"))
+        # (mtime_ns, models) cache for get_available_models
+        self._models_cache = None
 
         # Database
         self.db_path = self.app_dir / "data" / "dictation.db"
@@ -40,7 +93,23 @@ class Config:
         # Whisper configuration (defaults from .env, can be overridden by database)
         self.whisper_model = env_vars.get("WHISPER_MODEL", "Systran/faster-whisper-medium")  # Hugging Face model ID
         self.whisper_device = env_vars.get("WHISPER_DEVICE", "cuda")  # cuda or cpu
-        self.whisper_compute_type = env_vars.get("WHISPER_COMPUTE_TYPE", "float16")  # float16 for GPU, float32 for CPU
+        # int8_float16 = INT8 weight-only quantization with FP16 activations:
+        # roughly half the VRAM of float16 (medium: ~1.5 GB -> ~0.7 GB) and
+        # faster memory-bound decoding, with negligible accuracy loss.
+        # The backend downgrades it to int8 automatically on CPU.
+        self.whisper_compute_type = env_vars.get("WHISPER_COMPUTE_TYPE", "int8_float16")
+        # CPU path uses CTranslate2 dynamic INT8 (VNNI/dot-product kernels
+        # where available); FP16 variants are not efficient on CPUs
+        self.whisper_compute_type_cpu = env_vars.get("WHISPER_COMPUTE_TYPE_CPU", "int8")
+        # Keep the model in VRAM between dictation sessions so start()
+        # skips the multi-second weight reload; disable to free memory
+        # a few minutes after each stop()
+        self.whisper_keep_loaded = env_vars.get("WHISPER_KEEP_LOADED", "1") == "1"
+        # Load the model in the background at app start so the first
+        # dictation session does not block on the multi-second load
+        self.whisper_preload = env_vars.get("WHISPER_PRELOAD", "1") == "1"
+        # Results below this average confidence are dropped instead of typed
+        self.whisper_min_confidence = float(env_vars.get("WHISPER_MIN_CONFIDENCE", "0.35"))
 
         # Whisper Audio/VAD configuration (defaults from .env, can be overridden by database)
         device_index_str = env_vars.get("WHISPER_DEVICE_INDEX", "")
@@ -114,58 +183,50 @@ class Config:
         return self.languages
 
     def _load_env(self):
-        """Load environment variables from .env file"""
-        env_vars = {}
-        env_file = Path(__file__).parent.parent.parent / ".env"
-
-        if not env_file.exists():
-            return env_vars
-
-        try:
-            with open(env_file, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    # Skip comments and empty lines
-                    if not line or line.startswith('#'):
-                        continue
-                    # Parse KEY=VALUE
-                    if '=' in line:
-                        key, value = line.split('=', 1)
-                        env_vars[key.strip()] = value.strip()
-        except Exception as e:
-            from src.core.logging_controller import warning
-            warning(f"Could not load .env file: {e}")
-
-        return env_vars
+        """Load environment variables from the cached .env parse"""
+        return _load_env_file()
 
     def _create_directories(self):
         """Create necessary directories if they don't exist"""
-        (self.app_dir / "data").mkdir(parents=True, exist_ok=True)
-        (self.app_dir / "logs").mkdir(parents=True, exist_ok=True)
+        # isdir first: on warm starts a stat is cheaper than mkdir+EEXIST
+        for subdir in (self.app_dir / "data", self.app_dir / "logs"):
+            if not os.path.isdir(subdir):
+                subdir.mkdir(parents=True, exist_ok=True)
     
     def get_available_models(self):
         """Get list of available model directories"""
         if not self.models_dir.exists():
             return []
-        
+
+        # mtime-keyed cache: the directory only changes when a model is
+        # installed or removed, so repeated UI refreshes are free
+        mtime = self.models_dir.stat().st_mtime_ns
+        if self._models_cache is not None and self._models_cache[0] == mtime:
+            return self._models_cache[1]
+
         models = []
-        for item in self.models_dir.iterdir():
-            if item.is_dir() and item.name.startswith("vosk-model"):
-                models.append({
-                    "path": str(item),
-                    "name": item.name,
-                    "language": self._detect_language(item.name)
-                })
-        
-        return sorted(models, key=lambda x: x["name"])
+        # scandir reads the directory in one pass and DirEntry.is_dir
+        # uses the readdir-provided type for real directories, avoiding
+        # a stat() per entry; symlinks are followed like Path.is_dir so
+        # models symlinked into MODELS_DIR still show up
+        with os.scandir(self.models_dir) as entries:
+            for entry in entries:
+                if entry.is_dir() and entry.name.startswith("vosk-model"):
+                    models.append({
+                        "path": entry.path,
+                        "name": entry.name,
+                        "language": self._detect_language(entry.name)
+                    })
+
+        models.sort(key=lambda x: x["name"])
+        self._models_cache = (mtime, models)
+        return models
     
     def _detect_language(self, model_name):
         """Detect language from model name"""
-        model_lower = model_name.lower()
-        if "es" in model_lower or "spanish" in model_lower:
-            return "spanish"
-        elif "en" in model_lower or "english" in model_lower:
-            return "english"
+        match = _LANG_RE.search(model_name)
+        if match:
+            return _LANG_MAP[match.group(1).lower()]
         return "unknown"
 
     def get_language_by_code(self, code):
@@ -213,27 +274,30 @@ class Config:
             return
 
         try:
+            # Fetch everything once instead of one query per setting
+            settings = self.database.get_all_settings()
+
             # Load backend
-            backend = self.database.get_setting('backend')
+            backend = settings.get('backend')
             if backend:
                 self.backend = backend
 
             # Load Whisper model
-            whisper_model = self.database.get_setting('whisper_model')
+            whisper_model = settings.get('whisper_model')
             if whisper_model:
                 self.whisper_model = whisper_model
 
             # Load Whisper configuration
-            whisper_device = self.database.get_setting('whisper_device')
+            whisper_device = settings.get('whisper_device')
             if whisper_device:
                 self.whisper_device = whisper_device
 
-            whisper_compute = self.database.get_setting('whisper_compute_type')
+            whisper_compute = settings.get('whisper_compute_type')
             if whisper_compute:
                 self.whisper_compute_type = whisper_compute
 
             # Load device index
-            device_index_str = self.database.get_setting('whisper_device_index', '')
+            device_index_str = settings.get('whisper_device_index', '')
             if device_index_str.strip():
                 try:
                     self.whisper_device_index = int(device_index_str)
@@ -241,21 +305,21 @@ class Config:
                     pass  # Keep default
 
             # Load VAD parameters
-            silence_str = self.database.get_setting('whisper_silence_duration')
+            silence_str = settings.get('whisper_silence_duration')
             if silence_str:
                 try:
                     self.whisper_silence_duration = float(silence_str)
                 except ValueError:
                     pass  # Keep default
 
-            energy_str = self.database.get_setting('whisper_energy_threshold')
+            energy_str = settings.get('whisper_energy_threshold')
             if energy_str:
                 try:
                     self.whisper_energy_threshold = float(energy_str)
                 except ValueError:
                     pass  # Keep default
 
-            min_audio_str = self.database.get_setting('whisper_min_audio_length')
+            min_audio_str = settings.get('whisper_min_audio_length')
             if min_audio_str:
                 try:
                     self.whisper_min_audio_length = float(min_audio_str)
@@ -263,28 +327,28 @@ class Config:
                     pass  # Keep default
 
             # Load audio capture parameters
-            sample_rate_str = self.database.get_setting('whisper_sample_rate')
+            sample_rate_str = settings.get('whisper_sample_rate')
             if sample_rate_str:
                 try:
                     self.whisper_sample_rate = int(sample_rate_str)
                 except ValueError:
                     pass  # Keep default
 
-            chunk_size_str = self.database.get_setting('whisper_chunk_size')
+            chunk_size_str = settings.get('whisper_chunk_size')
             if chunk_size_str:
                 try:
                     self.whisper_chunk_size = int(chunk_size_str)
                 except ValueError:
                     pass  # Keep default
 
-            channels_str = self.database.get_setting('whisper_channels')
+            channels_str = settings.get('whisper_channels')
             if channels_str:
                 try:
                     self.whisper_channels = int(channels_str)
                 except ValueError:
                     pass  # Keep default
 
-            vad_aggressiveness_str = self.database.get_setting('whisper_vad_aggressiveness')
+            vad_aggressiveness_str = settings.get('whisper_vad_aggressiveness')
             if vad_aggressiveness_str:
                 try:
                     self.whisper_vad_aggressiveness = int(vad_aggressiveness_str)
@@ -292,7 +356,7 @@ class Config:
                     pass  # Keep default
 
             # Load debug flag
-            debug_str = self.database.get_setting('debug_enabled', 'false')
+            debug_str = settings.get('debug_enabled', 'false')
             self.debug_enabled = debug_str.lower() in ('true', '1', 'yes')
 
         except Exception as e:
@@ -349,12 +413,15 @@ class Config:
             'whisper_min_audio_length': env_vars.get('WHISPER_MIN_AUDIO_LENGTH'),
         }
 
-        # Migrate settings to database
+        # Migrate settings to database in one transaction
+        to_migrate = {
+            key: value for key, value in settings_to_migrate.items()
+            if value is not None and value.strip()  # Only migrate if value exists
+        }
         migrated_count = 0
-        for key, value in settings_to_migrate.items():
-            if value is not None and value.strip():  # Only migrate if value exists
-                self.database.save_setting(key, value)
-                migrated_count += 1
+        if self.database.save_settings(to_migrate):
+            migrated_count = len(to_migrate)
+            for key, value in to_migrate.items():
                 info(f"Migrated: {key} = {value}")
 
         # Mark migration as complete
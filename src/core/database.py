@@ -2,56 +2,127 @@
 Database management for Dictation Manager
 """
 
+import os
 import sqlite3
+import threading
 from datetime import datetime
 from pathlib import Path
 
 
+# Hot statements as module constants so the connection's prepared-statement
+# cache is hit by the same string on every call
+_SQL_STOP_RUNNING = """
+    UPDATE sessions
+    SET status = 'stopped', stopped_at = ?
+    WHERE status = 'running'
+"""
+_SQL_INSERT_SESSION = """
+    INSERT INTO sessions (language, model_path, model_name, backend, whisper_model, started_at, status)
+    VALUES (?, ?, ?, ?, ?, ?, 'running')
+"""
+_SQL_GET_CURRENT_SESSION = """
+    SELECT id, language, model_path, model_name, backend, whisper_model, started_at
+    FROM sessions
+    WHERE status = 'running'
+    ORDER BY started_at DESC
+    LIMIT 1
+"""
+_SQL_GET_LAST_USED_MODEL = """
+    SELECT model_path AS path, model_name AS name
+    FROM sessions
+    WHERE language = ?
+    ORDER BY started_at DESC
+    LIMIT 1
+"""
+_SQL_GET_SESSION_HISTORY = """
+    SELECT id, language, model_name, backend, whisper_model, started_at, stopped_at, status
+    FROM sessions
+    ORDER BY started_at DESC
+    LIMIT ?
+"""
+_SQL_ALL_SETTINGS = "SELECT key, value FROM settings"
+_SQL_UPSERT_SETTING = """
+    INSERT OR REPLACE INTO settings (key, value, updated_at)
+    VALUES (?, ?, ?)
+"""
+_SQL_DELETE_SETTING = "DELETE FROM settings WHERE key = ?"
+
+
 class Database:
     """SQLite database manager"""
-    
+
     def __init__(self, db_path):
         self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-    
+        # isdir first: on warm starts a stat is cheaper than mkdir+EEXIST
+        if not os.path.isdir(self.db_path.parent):
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Single persistent connection, shared across threads behind a lock
+        self._conn = None
+        self._db_lock = threading.RLock()
+        # In-memory settings cache, populated lazily on first read
+        self._settings_cache = None
+        self._settings_lock = threading.Lock()
+        # Migration is one-way, so a positive answer can be memoized
+        self._migration_complete = False
+
     def get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(str(self.db_path))
-    
+        """Get the shared database connection, opening it on first use"""
+        with self._db_lock:
+            if self._conn is None:
+                self._conn = sqlite3.connect(
+                    str(self.db_path),
+                    check_same_thread=False,
+                    cached_statements=256,
+                )
+                self._conn.row_factory = sqlite3.Row
+                # WAL avoids writer/reader blocking; NORMAL sync is safe with WAL
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+                self._conn.execute("PRAGMA temp_store=MEMORY")
+            return self._conn
+
+    def close(self):
+        """Close the shared database connection"""
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
     def initialize(self):
         """Initialize database schema"""
         conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        # Create sessions table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS sessions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                language TEXT NOT NULL,
-                model_path TEXT NOT NULL,
-                model_name TEXT NOT NULL,
-                backend TEXT NOT NULL DEFAULT 'vosk',
-                whisper_model TEXT,
-                started_at TEXT NOT NULL,
-                stopped_at TEXT,
-                status TEXT NOT NULL DEFAULT 'running'
-            )
-        """)
-        
-        # Create settings table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS settings (
-                key TEXT PRIMARY KEY,
-                value TEXT NOT NULL,
-                updated_at TEXT NOT NULL
-            )
-        """)
-
-        # Migrate database schema if needed
-        self._migrate_schema(cursor)
-
-        conn.commit()
-        conn.close()
+
+        with self._db_lock, conn:
+            cursor = conn.cursor()
+
+            # Create core tables and indexes in a single script
+            cursor.executescript("""
+                CREATE TABLE IF NOT EXISTS sessions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    language TEXT NOT NULL,
+                    model_path TEXT NOT NULL,
+                    model_name TEXT NOT NULL,
+                    backend TEXT NOT NULL DEFAULT 'vosk',
+                    whisper_model TEXT,
+                    started_at TEXT NOT NULL,
+                    stopped_at TEXT,
+                    status TEXT NOT NULL DEFAULT 'running'
+                );
+
+                CREATE TABLE IF NOT EXISTS settings (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_sessions_status
+                    ON sessions(status);
+                CREATE INDEX IF NOT EXISTS idx_sessions_lang_started
+                    ON sessions(language, started_at DESC);
+            """)
+
+            # Migrate database schema if needed
+            self._migrate_schema(cursor)
 
     def _migrate_schema(self, cursor):
         """Migrate database schema to latest version"""
@@ -70,8 +141,8 @@ class Database:
                 cursor.execute("ALTER TABLE sessions ADD COLUMN whisper_model TEXT")
                 print("Added 'whisper_model' column to sessions table")
 
-            # Create voice command settings table
-            cursor.execute("""
+            # Create voice command and custom command tables
+            cursor.executescript("""
                 CREATE TABLE IF NOT EXISTS voice_command_settings (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     keyword TEXT NOT NULL DEFAULT 'tony',
@@ -80,11 +151,8 @@ class Database:
                     enabled BOOLEAN NOT NULL DEFAULT 0,
                     created_at TEXT NOT NULL,
                     updated_at TEXT NOT NULL
-                )
-            """)
+                );
 
-            # Create custom commands table
-            cursor.execute("""
                 CREATE TABLE IF NOT EXISTS custom_commands (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     name TEXT NOT NULL UNIQUE,
@@ -94,7 +162,7 @@ class Database:
                     enabled BOOLEAN NOT NULL DEFAULT 1,
                     created_at TEXT NOT NULL,
                     updated_at TEXT NOT NULL
-                )
+                );
             """)
 
             # Check if max_command_words column exists
@@ -148,124 +216,88 @@ class Database:
 
         except Exception as e:
             print(f"Database migration warning: {e}")
-    
+
     def start_session(self, language, model_path, model_name, backend='vosk', whisper_model=None):
         """Record a new dictation session start"""
         conn = self.get_connection()
-        cursor = conn.cursor()
+        now = datetime.now().isoformat()
 
-        # Stop any running sessions first
-        cursor.execute("""
-            UPDATE sessions
-            SET status = 'stopped', stopped_at = ?
-            WHERE status = 'running'
-        """, (datetime.now().isoformat(),))
+        with self._db_lock, conn:
+            cursor = conn.cursor()
 
-        # Insert new session
-        cursor.execute("""
-            INSERT INTO sessions (language, model_path, model_name, backend, whisper_model, started_at, status)
-            VALUES (?, ?, ?, ?, ?, ?, 'running')
-        """, (language, model_path, model_name, backend, whisper_model, datetime.now().isoformat()))
+            # Stop any running sessions first
+            cursor.execute(_SQL_STOP_RUNNING, (now,))
 
-        session_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+            # Insert new session
+            cursor.execute(_SQL_INSERT_SESSION,
+                           (language, model_path, model_name, backend, whisper_model, now))
+
+            session_id = cursor.lastrowid
 
         return session_id
-    
+
     def stop_session(self):
         """Stop current running session"""
         conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE sessions 
-            SET status = 'stopped', stopped_at = ?
-            WHERE status = 'running'
-        """, (datetime.now().isoformat(),))
-        
-        conn.commit()
-        conn.close()
-    
+
+        with self._db_lock, conn:
+            conn.execute(_SQL_STOP_RUNNING, (datetime.now().isoformat(),))
+
     def get_current_session(self):
         """Get current running session"""
         conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT id, language, model_path, model_name, backend, whisper_model, started_at
-            FROM sessions
-            WHERE status = 'running'
-            ORDER BY started_at DESC
-            LIMIT 1
-        """)
-
-        result = cursor.fetchone()
-        conn.close()
 
-        if result:
-            return {
-                "id": result[0],
-                "language": result[1],
-                "model_path": result[2],
-                "model_name": result[3],
-                "backend": result[4],
-                "whisper_model": result[5],
-                "started_at": result[6]
-            }
-        return None
-    
+        with self._db_lock:
+            cursor = conn.cursor()
+
+            cursor.execute(_SQL_GET_CURRENT_SESSION)
+
+            result = cursor.fetchone()
+
+        return dict(result) if result else None
+
     def get_last_used_model(self, language):
         """Get the last used model for a specific language"""
         conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT model_path, model_name
-            FROM sessions
-            WHERE language = ?
-            ORDER BY started_at DESC
-            LIMIT 1
-        """, (language,))
-        
-        result = cursor.fetchone()
-        conn.close()
-        
-        if result:
-            return {"path": result[0], "name": result[1]}
-        return None
-    
+
+        with self._db_lock:
+            cursor = conn.cursor()
+
+            cursor.execute(_SQL_GET_LAST_USED_MODEL, (language,))
+
+            result = cursor.fetchone()
+
+        return dict(result) if result else None
+
     def get_session_history(self, limit=50):
         """Get session history"""
         conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT id, language, model_name, backend, whisper_model, started_at, stopped_at, status
-            FROM sessions
-            ORDER BY started_at DESC
-            LIMIT ?
-        """, (limit,))
-
-        results = cursor.fetchall()
-        conn.close()
-
-        return [
-            {
-                "id": r[0],
-                "language": r[1],
-                "model_name": r[2],
-                "backend": r[3],
-                "whisper_model": r[4],
-                "started_at": r[5],
-                "stopped_at": r[6],
-                "status": r[7]
-            }
-            for r in results
-        ]
+
+        with self._db_lock:
+            cursor = conn.cursor()
+
+            cursor.execute(_SQL_GET_SESSION_HISTORY, (limit,))
+
+            results = cursor.fetchall()
+
+        return [dict(r) for r in results]
 
     # Settings management methods
 
+    def _load_settings_cache(self):
+        """Populate the settings cache from the database (caller holds lock)"""
+        conn = self.get_connection()
+
+        with self._db_lock:
+            cursor = conn.cursor()
+            cursor.execute(_SQL_ALL_SETTINGS)
+            self._settings_cache = {row[0]: row[1] for row in cursor.fetchall()}
+
+    def clear_cache(self):
+        """Invalidate the settings cache (reloaded on next read)"""
+        with self._settings_lock:
+            self._settings_cache = None
+
     def save_setting(self, key, value):
         """
         Save or update a setting in the database.
@@ -278,24 +310,66 @@ class Database:
             True if successful
         """
         conn = self.get_connection()
-        cursor = conn.cursor()
 
         try:
             # Convert value to string for storage
             value_str = str(value) if value is not None else ""
 
-            cursor.execute("""
-                INSERT OR REPLACE INTO settings (key, value, updated_at)
-                VALUES (?, ?, ?)
-            """, (key, value_str, datetime.now().isoformat()))
+            # Skip the write entirely when the stored value already matches
+            with self._settings_lock:
+                if self._settings_cache is None:
+                    self._load_settings_cache()
+                if self._settings_cache.get(key) == value_str:
+                    return True
+
+            with self._db_lock, conn:
+                conn.execute(_SQL_UPSERT_SETTING,
+                             (key, value_str, datetime.now().isoformat()))
+
+            with self._settings_lock:
+                if self._settings_cache is not None:
+                    self._settings_cache[key] = value_str
 
-            conn.commit()
             return True
         except Exception as e:
             print(f"Error saving setting {key}: {e}")
             return False
-        finally:
-            conn.close()
+
+    def save_settings(self, settings):
+        """
+        Save multiple settings in a single transaction.
+
+        Args:
+            settings: Dictionary of key: value pairs to store
+
+        Returns:
+            True if successful
+        """
+        if not settings:
+            return True
+
+        conn = self.get_connection()
+
+        try:
+            now = datetime.now().isoformat()
+            rows = [
+                (key, str(value) if value is not None else "", now)
+                for key, value in settings.items()
+            ]
+
+            # One commit (and one fsync) for the whole batch
+            with self._db_lock, conn:
+                conn.executemany(_SQL_UPSERT_SETTING, rows)
+
+            with self._settings_lock:
+                if self._settings_cache is not None:
+                    for key, value_str, _ in rows:
+                        self._settings_cache[key] = value_str
+
+            return True
+        except Exception as e:
+            print(f"Error saving settings: {e}")
+            return False
 
     def get_setting(self, key, default=None):
         """
@@ -308,21 +382,14 @@ class Database:
         Returns:
             Setting value as string, or default if not found
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
         try:
-            cursor.execute("""
-                SELECT value FROM settings WHERE key = ?
-            """, (key,))
-
-            result = cursor.fetchone()
-            return result[0] if result else default
+            with self._settings_lock:
+                if self._settings_cache is None:
+                    self._load_settings_cache()
+                return self._settings_cache.get(key, default)
         except Exception as e:
             print(f"Error getting setting {key}: {e}")
             return default
-        finally:
-            conn.close()
 
     def get_all_settings(self):
         """
@@ -331,18 +398,14 @@ class Database:
         Returns:
             Dictionary with all settings (key: value)
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
         try:
-            cursor.execute("SELECT key, value FROM settings")
-            results = cursor.fetchall()
-            return {row[0]: row[1] for row in results}
+            with self._settings_lock:
+                if self._settings_cache is None:
+                    self._load_settings_cache()
+                return dict(self._settings_cache)
         except Exception as e:
             print(f"Error getting all settings: {e}")
             return {}
-        finally:
-            conn.close()
 
     def delete_setting(self, key):
         """
@@ -355,17 +418,19 @@ class Database:
             True if successful
         """
         conn = self.get_connection()
-        cursor = conn.cursor()
 
         try:
-            cursor.execute("DELETE FROM settings WHERE key = ?", (key,))
-            conn.commit()
+            with self._db_lock, conn:
+                conn.execute(_SQL_DELETE_SETTING, (key,))
+
+            with self._settings_lock:
+                if self._settings_cache is not None:
+                    self._settings_cache.pop(key, None)
+
             return True
         except Exception as e:
             print(f"Error deleting setting {key}: {e}")
             return False
-        finally:
-            conn.close()
 
     def is_migration_complete(self):
         """
@@ -374,8 +439,12 @@ class Database:
         Returns:
             True if migration has been done, False otherwise
         """
+        if self._migration_complete:
+            return True
+
         migration_done = self.get_setting('migration_completed', 'false')
-        return migration_done.lower() in ('true', '1', 'yes')
+        self._migration_complete = migration_done.lower() in ('true', '1', 'yes')
+        return self._migration_complete
 
     def mark_migration_complete(self):
         """
@@ -384,7 +453,12 @@ class Database:
         Returns:
             True if successful
         """
-        return self.save_setting('migration_completed', 'true')
+        result = self.save_setting('migration_completed', 'true')
+        if result:
+            self._migration_complete = True
+        # Migration writes settings directly, so force a fresh read next time
+        self.clear_cache()
+        return result
 
     # Voice command settings methods
 
@@ -405,29 +479,26 @@ class Database:
             True if successful
         """
         conn = self.get_connection()
-        cursor = conn.cursor()
 
         try:
             # Update or insert settings
-            cursor.execute("""
-                INSERT OR REPLACE INTO voice_command_settings
-                (id, keyword, timeout_seconds, sensitivity, enabled, max_command_words, created_at, updated_at)
-                VALUES (
-                    (SELECT id FROM voice_command_settings LIMIT 1),
-                    ?, ?, ?, ?, ?,
-                    COALESCE((SELECT created_at FROM voice_command_settings LIMIT 1), ?),
-                    ?
-                )
-            """, (keyword, timeout, sensitivity, 1 if enabled else 0, max_command_words,
-                  datetime.now().isoformat(), datetime.now().isoformat()))
+            with self._db_lock, conn:
+                conn.execute("""
+                    INSERT OR REPLACE INTO voice_command_settings
+                    (id, keyword, timeout_seconds, sensitivity, enabled, max_command_words, created_at, updated_at)
+                    VALUES (
+                        (SELECT id FROM voice_command_settings LIMIT 1),
+                        ?, ?, ?, ?, ?,
+                        COALESCE((SELECT created_at FROM voice_command_settings LIMIT 1), ?),
+                        ?
+                    )
+                """, (keyword, timeout, sensitivity, 1 if enabled else 0, max_command_words,
+                      datetime.now().isoformat(), datetime.now().isoformat()))
 
-            conn.commit()
             return True
         except Exception as e:
             print(f"Error saving voice command settings: {e}")
             return False
-        finally:
-            conn.close()
 
     def get_voice_command_settings(self):
         """
@@ -437,17 +508,19 @@ class Database:
             Dictionary with settings or defaults if not found
         """
         conn = self.get_connection()
-        cursor = conn.cursor()
 
         try:
-            cursor.execute("""
-                SELECT keyword, timeout_seconds, sensitivity, enabled, max_command_words
-                FROM voice_command_settings
-                ORDER BY id DESC
-                LIMIT 1
-            """)
+            with self._db_lock:
+                cursor = conn.cursor()
 
-            result = cursor.fetchone()
+                cursor.execute("""
+                    SELECT keyword, timeout_seconds, sensitivity, enabled, max_command_words
+                    FROM voice_command_settings
+                    ORDER BY id DESC
+                    LIMIT 1
+                """)
+
+                result = cursor.fetchone()
 
             if result:
                 return {
@@ -475,8 +548,6 @@ class Database:
                 'enabled': False,
                 'max_command_words': 1
             }
-        finally:
-            conn.close()
 
     def save_custom_command(self, name: str, keys: str, description: str,
                           category: str = 'Custom', enabled: bool = True):
@@ -494,25 +565,22 @@ class Database:
             True if successful
         """
         conn = self.get_connection()
-        cursor = conn.cursor()
 
         try:
-            cursor.execute("""
-                INSERT OR REPLACE INTO custom_commands
-                (name, keys, description, category, enabled, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?,
-                    COALESCE((SELECT created_at FROM custom_commands WHERE name = ?), ?),
-                    ?)
-            """, (name, keys, description, category, 1 if enabled else 0,
-                  name, datetime.now().isoformat(), datetime.now().isoformat()))
-
-            conn.commit()
+            with self._db_lock, conn:
+                conn.execute("""
+                    INSERT OR REPLACE INTO custom_commands
+                    (name, keys, description, category, enabled, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?,
+                        COALESCE((SELECT created_at FROM custom_commands WHERE name = ?), ?),
+                        ?)
+                """, (name, keys, description, category, 1 if enabled else 0,
+                      name, datetime.now().isoformat(), datetime.now().isoformat()))
+
             return True
         except Exception as e:
             print(f"Error saving custom command: {e}")
             return False
-        finally:
-            conn.close()
 
     def get_custom_commands(self):
         """
@@ -522,16 +590,19 @@ class Database:
             List of custom command dictionaries
         """
         conn = self.get_connection()
-        cursor = conn.cursor()
 
         try:
-            cursor.execute("""
-                SELECT name, keys, description, category, enabled
-                FROM custom_commands
-                ORDER BY name
-            """)
+            with self._db_lock:
+                cursor = conn.cursor()
+
+                cursor.execute("""
+                    SELECT name, keys, description, category, enabled
+                    FROM custom_commands
+                    ORDER BY name
+                """)
+
+                results = cursor.fetchall()
 
-            results = cursor.fetchall()
             return [
                 {
                     'name': r[0],
@@ -545,8 +616,6 @@ class Database:
         except Exception as e:
             print(f"Error getting custom commands: {e}")
             return []
-        finally:
-            conn.close()
 
     def delete_custom_command(self, name: str):
         """
@@ -559,17 +628,14 @@ class Database:
             True if successful
         """
         conn = self.get_connection()
-        cursor = conn.cursor()
 
         try:
-            cursor.execute("DELETE FROM custom_commands WHERE name = ?", (name,))
-            conn.commit()
+            with self._db_lock, conn:
+                conn.execute("DELETE FROM custom_commands WHERE name = ?", (name,))
             return True
         except Exception as e:
             print(f"Error deleting custom command: {e}")
             return False
-        finally:
-            conn.close()
 
     def save_commands_json(self, commands_json: str):
         """
@@ -606,31 +672,29 @@ class Database:
             True if successful
         """
         conn = self.get_connection()
-        cursor = conn.cursor()
 
         try:
-            for level, enabled in filters.items():
-                if level in ['INFO', 'WARNING', 'ERROR', 'CRITICAL']:
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO log_filters
-                        (id, level, enabled, created_at, updated_at)
-                        VALUES (
-                            COALESCE((SELECT id FROM log_filters WHERE level = ?),
-                                     (SELECT COALESCE(MAX(id), 0) + 1 FROM log_filters)),
-                            ?, ?,
-                            COALESCE((SELECT created_at FROM log_filters WHERE level = ?), ?),
-                            ?
-                        )
-                    """, (level, level, 1 if enabled else 0, level,
-                          datetime.now().isoformat(), datetime.now().isoformat()))
-
-            conn.commit()
+            with self._db_lock, conn:
+                cursor = conn.cursor()
+                for level, enabled in filters.items():
+                    if level in ['INFO', 'WARNING', 'ERROR', 'CRITICAL']:
+                        cursor.execute("""
+                            INSERT OR REPLACE INTO log_filters
+                            (id, level, enabled, created_at, updated_at)
+                            VALUES (
+                                COALESCE((SELECT id FROM log_filters WHERE level = ?),
+                                         (SELECT COALESCE(MAX(id), 0) + 1 FROM log_filters)),
+                                ?, ?,
+                                COALESCE((SELECT created_at FROM log_filters WHERE level = ?), ?),
+                                ?
+                            )
+                        """, (level, level, 1 if enabled else 0, level,
+                              datetime.now().isoformat(), datetime.now().isoformat()))
+
             return True
         except Exception as e:
             print(f"Error saving log filters: {e}")
             return False
-        finally:
-            conn.close()
 
     def get_log_filters(self) -> dict:
         """
@@ -640,11 +704,12 @@ class Database:
             Dictionary with filter settings
         """
         conn = self.get_connection()
-        cursor = conn.cursor()
 
         try:
-            cursor.execute("SELECT level, enabled FROM log_filters")
-            results = cursor.fetchall()
+            with self._db_lock:
+                cursor = conn.cursor()
+                cursor.execute("SELECT level, enabled FROM log_filters")
+                results = cursor.fetchall()
 
             # Return defaults if no filters found
             if not results:
@@ -664,5 +729,3 @@ class Database:
                 'ERROR': True,
                 'CRITICAL': True
             }
-        finally:
-            conn.close()
\ No newline at end of file
@@ -91,7 +91,10 @@ class DictationController:
                         whisper_model = model_part
 
                 whisper_device = getattr(self.config, 'whisper_device', 'cuda')
-                whisper_compute_type = getattr(self.config, 'whisper_compute_type', 'float16')
+                whisper_compute_type = getattr(self.config, 'whisper_compute_type', 'int8_float16')
+                if whisper_device == 'cpu':
+                    # CPU has its own quantization default (dynamic INT8)
+                    whisper_compute_type = getattr(self.config, 'whisper_compute_type_cpu', 'int8')
 
                 # VAD configuration
                 device_index = getattr(self.config, 'whisper_device_index', None)
@@ -119,6 +122,20 @@ class DictationController:
                     vad_aggressiveness=vad_aggressiveness,
                     database=self.database
                 )
+                self.backends['whisper'].min_confidence = getattr(
+                    self.config, 'whisper_min_confidence', 0.35)
+
+                if getattr(self.config, 'whisper_keep_loaded', True):
+                    # Keep weights resident between sessions; the default
+                    # is otherwise a timed unload a few minutes after stop()
+                    self.backends['whisper'].set_idle_unload_seconds(None)
+
+                if (getattr(self.config, 'whisper_preload', True)
+                        and self.backend_type == 'whisper'):
+                    # Warm the model while the UI comes up so the first
+                    # hotkey press does not block on the weight load
+                    self.backends['whisper'].preload_model_async()
+
                 info(f"Whisper backend initialized with model '{whisper_model}' on {whisper_device} "
                           f"(silence={silence_duration}s, threshold={energy_threshold}, min_length={min_audio_length}s)")
             except Exception as e:
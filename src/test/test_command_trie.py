@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test script for the CommandRegistry word-prefix trie.
+Verifies find_longest_command picks the longest registered command,
+respects max_words, and that the trie is rebuilt on (un)registration.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path (now we're in src/test, go up to project root)
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / 'src'))
+
+from backends.whisper.command_registry import CommandRegistry
+
+print("="*60)
+print("Command Trie Lookup Test")
+print("="*60)
+print()
+
+registry = CommandRegistry()
+registry.register_command('open', ['ctrl+o'], 'Open')
+registry.register_command('open browser', ['super+b'], 'Open the browser')
+registry.register_command('enter', ['Return'], 'Press enter')
+
+test_cases = [
+    (['open', 'browser', 'now'], 3, ('open browser', 2),
+     "Longest command wins over its prefix"),
+    (['open', 'tab'], 3, ('open', 1),
+     "Falls back to the shorter prefix command"),
+    (['enter'], 3, ('enter', 1),
+     "Single-word command"),
+    (['open', 'browser'], 1, ('open', 1),
+     "max_words=1 stops the walk after one word"),
+    (['unknown', 'words'], 3, None,
+     "No registered command matches"),
+    ([], 3, None,
+     "Empty word list"),
+]
+
+all_passed = True
+for words, max_words, expected, description in test_cases:
+    got = registry.find_longest_command(words, max_words)
+
+    if got == expected:
+        status = "✓ PASS"
+    else:
+        status = "✗ FAIL"
+        all_passed = False
+
+    print(f"{status}: {words} (max_words={max_words})")
+    print(f"        {description}")
+    print(f"        Expected: {expected}")
+    print(f"        Got:      {got}")
+    print()
+
+# The trie must follow registration changes
+registry.unregister_command('open browser')
+got = registry.find_longest_command(['open', 'browser'], 3)
+if got == ('open', 1):
+    print("✓ PASS: trie rebuilt after unregister_command")
+else:
+    print(f"✗ FAIL: expected ('open', 1) after unregister, got {got}")
+    all_passed = False
+print()
+
+print("="*60)
+if all_passed:
+    print("✅ All tests PASSED!")
+else:
+    print("❌ Some tests FAILED!")
+print("="*60)
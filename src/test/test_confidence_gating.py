@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script for the transcription confidence gate.
+Verifies that low-confidence results and stock hallucinations are
+dropped before reaching the keyboard, while confident results and
+results without confidence data are typed.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path (now we're in src/test, go up to project root)
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / 'src'))
+
+from backends.whisper.keyboard_output import TextProcessor
+from backends.whisper.transcriber import TranscriptionResult
+from backends.whisper_backend import WhisperBackend
+
+print("="*60)
+print("Confidence Gating Test")
+print("="*60)
+print()
+
+
+class FakeKeyboardOutput:
+    """Captures type_text calls instead of driving xdotool."""
+
+    def __init__(self):
+        self.typed = []
+
+    def type_text(self, text, enable_correction=True, completion_event=None):
+        self.typed.append(text)
+        if completion_event:
+            completion_event.set()
+
+
+def make_result(text, confidence):
+    return TranscriptionResult(
+        text=text,
+        language='en',
+        language_probability=1.0,
+        duration=1.0,
+        transcription_time=0.1,
+        real_time_factor=0.1,
+        avg_confidence=confidence
+    )
+
+
+backend = WhisperBackend(device='cpu')
+backend.text_processor = TextProcessor()
+backend.keyboard_output = FakeKeyboardOutput()
+backend.voice_commands_enabled = False
+
+test_cases = [
+    ("hello world", 0.2, False, "Below min_confidence is dropped"),
+    ("Thank you.", 0.5, False, "Weak-confidence stock hallucination is dropped"),
+    ("Thank you.", 0.9, True, "Confident 'Thank you.' is typed"),
+    ("no confidence data", None, True, "Missing confidence bypasses the gate"),
+    ("a normal sentence", 0.8, True, "Confident result is typed"),
+]
+
+all_passed = True
+for text, confidence, should_type, description in test_cases:
+    typed_before = len(backend.keyboard_output.typed)
+    backend._process_transcription_result(make_result(text, confidence))
+    was_typed = len(backend.keyboard_output.typed) > typed_before
+
+    if was_typed == should_type:
+        status = "✓ PASS"
+    else:
+        status = "✗ FAIL"
+        all_passed = False
+
+    print(f"{status}: '{text}' (confidence={confidence})")
+    print(f"        {description}")
+    print(f"        Expected typed={should_type}, got typed={was_typed}")
+    print()
+
+print("="*60)
+if all_passed:
+    print("✅ All tests PASSED!")
+else:
+    print("❌ Some tests FAILED!")
+print("="*60)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test script for the Database layer.
+Verifies the persistent WAL connection, the in-memory settings cache
+(population, in-place mutation, invalidation), sessions bookkeeping and
+the batched save_settings path.
+"""
+
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# Add project root to path (now we're in src/test, go up to project root)
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / 'src'))
+
+from src.core.database import Database
+
+print("="*60)
+print("Database Test")
+print("="*60)
+print()
+
+all_passed = True
+
+
+def check(condition, description):
+    global all_passed
+    status = "✓ PASS" if condition else "✗ FAIL"
+    if not condition:
+        all_passed = False
+    print(f"{status}: {description}")
+
+
+db_path = Path(tempfile.mkdtemp()) / "test.db"
+db = Database(db_path)
+db.initialize()
+
+# --- Persistent connection ---
+conn = db.get_connection()
+check(conn is db.get_connection(), "get_connection returns the same connection")
+check(conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal',
+      "connection runs in WAL mode")
+check(db.initialize() is None and db.get_connection() is conn,
+      "initialize() is idempotent on the open connection")
+
+# --- Settings cache ---
+check(db.get_setting('missing', 'dflt') == 'dflt',
+      "get_setting falls back to the default")
+db.save_setting('alpha', 'one')
+check(db.get_setting('alpha') == 'one', "save_setting is visible via the cache")
+db.save_setting('alpha', 'two')
+check(db.get_setting('alpha') == 'two', "cache is mutated on overwrite")
+db.delete_setting('alpha')
+check(db.get_setting('alpha') is None, "delete_setting evicts the cache entry")
+
+# Unchanged values skip the write (updated_at must not move)
+db.save_setting('beta', 'same')
+first = conn.execute("SELECT updated_at FROM settings WHERE key='beta'").fetchone()[0]
+db.save_setting('beta', 'same')
+second = conn.execute("SELECT updated_at FROM settings WHERE key='beta'").fetchone()[0]
+check(first == second, "unchanged save_setting skips the write")
+
+# clear_cache forces a fresh read of out-of-band writes
+with conn:
+    conn.execute("INSERT OR REPLACE INTO settings (key, value, updated_at) "
+                 "VALUES ('gamma', 'direct', '')")
+check(db.get_setting('gamma') is None,
+      "cache serves reads without hitting the table")
+db.clear_cache()
+check(db.get_setting('gamma') == 'direct',
+      "clear_cache picks up direct table writes")
+
+# Batched writes populate both the table and the cache
+db.save_settings({'d1': 'x', 'd2': 2, 'd3': None})
+check(db.get_setting('d1') == 'x' and db.get_setting('d2') == '2'
+      and db.get_setting('d3') == '',
+      "save_settings stores a batch and stringifies values")
+check(db.save_settings({}) is True, "empty save_settings batch is a no-op")
+
+# Cross-thread access through the shared connection
+worker_ok = []
+def worker():
+    db.save_setting('threaded', 'yes')
+    worker_ok.append(db.get_setting('threaded') == 'yes')
+t = threading.Thread(target=worker)
+t.start()
+t.join()
+check(worker_ok == [True], "settings survive a round-trip from another thread")
+
+# --- Migration flag ---
+check(db.is_migration_complete() is False, "migration starts incomplete")
+db.mark_migration_complete()
+check(db.is_migration_complete() is True, "mark_migration_complete sticks")
+
+# --- Sessions ---
+sid = db.start_session('es', '/models/a', 'model-a', backend='whisper',
+                       whisper_model='base')
+current = db.get_current_session()
+check(current is not None and current['id'] == sid
+      and current['whisper_model'] == 'base',
+      "start_session creates the running session")
+sid2 = db.start_session('en', '/models/b', 'model-b')
+check(db.get_current_session()['id'] == sid2,
+      "a new session stops the previous one")
+db.stop_session()
+check(db.get_current_session() is None, "stop_session clears the running session")
+check(db.get_last_used_model('es') == {'path': '/models/a', 'name': 'model-a'},
+      "get_last_used_model returns path/name keys")
+history = db.get_session_history()
+check(len(history) == 2 and history[0]['status'] == 'stopped',
+      "get_session_history lists stopped sessions")
+
+db.close()
+
+# A fresh instance reads everything back from disk
+db2 = Database(db_path)
+check(db2.get_setting('d1') == 'x' and db2.is_migration_complete() is True,
+      "settings and migration flag persist across instances")
+db2.close()
+
+print()
+print("="*60)
+if all_passed:
+    print("✅ All tests PASSED!")
+else:
+    print("❌ Some tests FAILED!")
+print("="*60)
@@ -12,6 +12,7 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(project_root / 'src'))
 
+from backends.whisper.keyboard_output import TextProcessor
 from backends.whisper.keyword_detector import KeywordDetector
 
 print("="*60)
@@ -76,6 +77,34 @@ for text, should_detect, expected_cmd, description in test_cases:
     # Reset detector for next test
     detector.reset()
 
+print("Testing spoken punctuation commands in TextProcessor:")
+print()
+
+processor = TextProcessor()
+
+processor_cases = [
+    ("hello period", "hello.", "Spoken period attaches to previous word"),
+    ("hello comma world", "hello, world", "Spoken comma mid-sentence"),
+    ("hello new line world", "hello\nworld", "Multi-word 'new line' emits a newline"),
+    ("hello newline world", "hello\nworld", "Single-word 'newline' emits a newline"),
+    ("hello paragraph world", "hello\n\nworld", "'paragraph' emits a blank line"),
+]
+
+for text, expected, description in processor_cases:
+    got = processor.process_text(text)
+
+    if got == expected:
+        status = "✓ PASS"
+    else:
+        status = "✗ FAIL"
+        all_passed = False
+
+    print(f"{status}: '{text}'")
+    print(f"        {description}")
+    print(f"        Expected: {expected!r}")
+    print(f"        Got:      {got!r}")
+    print()
+
 print("="*60)
 if all_passed:
     print("✅ All tests PASSED!")
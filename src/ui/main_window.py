@@ -522,11 +522,11 @@ class MainWindow:
 
         # Compute Type selection
         ttk.Label(self.whisper_frame, text="Compute Type:", font=("Arial", 9)).grid(row=7, column=0, sticky=tk.W, pady=5)
-        self.whisper_compute_type_var = tk.StringVar(value="float16")
+        self.whisper_compute_type_var = tk.StringVar(value="int8_float16")
         compute_combo = ttk.Combobox(
             self.whisper_frame,
             textvariable=self.whisper_compute_type_var,
-            values=["float16", "float32"],
+            values=["int8_float16", "int8", "float16", "float32"],
             state="readonly",
             width=15
         )
@@ -646,7 +646,7 @@ class MainWindow:
 
         # Default values
         self.whisper_device_var.set("cuda")
-        self.whisper_compute_type_var.set("float16")
+        self.whisper_compute_type_var.set("int8_float16")
         self.whisper_device_index_var.set("Default")  # Use "Default" instead of ""
         self.whisper_silence_var.set(0.5)
         self.whisper_energy_var.set(0.008)